@@ -10,7 +10,8 @@ from .layout import Composable, Layout, AdjointLayout, NdLayout
 from .ndmapping import OrderedDict, UniformNdMapping, NdMapping, item_check
 from .overlay import Overlayable, NdOverlay, Overlay, CompositeOverlay
 from .tree import AttrTree
-from .util import sanitize_identifier
+from .util import (sanitize_identifier, factorize, group_reduce, basestring,
+                   array_range, find_range, stream_reduce)
 
 
 class Element(ViewableElement, Composable, Overlayable):
@@ -23,6 +24,10 @@ class Element(ViewableElement, Composable, Overlayable):
 
     group = param.String(default='Element', constant=True)
 
+    # Attributes caching values derived from the data, which are
+    # recomputed on demand and therefore not pickled
+    _cache_attributes = ['_range_cache']
+
     def hist(self, dimension=None, num_bins=20, bin_range=None,
              adjoin=True, individually=True, **kwargs):
         """
@@ -38,6 +43,22 @@ class Element(ViewableElement, Composable, Overlayable):
                          individually=individually, dimension=dimension, **kwargs)
 
 
+    def _cached_range(self, dimension, compute):
+        """
+        Returns the data range along the named dimension. On a cache
+        miss compute is called and should return a dictionary of
+        ranges, allowing the ranges of several dimensions to be filled
+        in a single pass over the data. The cache is discarded
+        whenever the data attribute is replaced.
+        """
+        cache = getattr(self, '_range_cache', None)
+        if cache is None or cache[0] is not self.data:
+            cache = self._range_cache = (self.data, {})
+        if dimension not in cache[1]:
+            cache[1].update(compute())
+        return cache[1][dimension]
+
+
     #======================#
     # Subclassable methods #
     #======================#
@@ -54,6 +75,13 @@ class Element(ViewableElement, Composable, Overlayable):
             self.data = self._convert_element(element)
 
 
+    def __getstate__(self):
+        state = super(Element, self).__getstate__()
+        for attr in self._cache_attributes:
+            state.pop(attr, None)
+        return state
+
+
     def _convert_element(self, element):
         type_str = self.__class__.__name__
         type_name = type_str.lower()
@@ -163,6 +191,34 @@ class Element2D(Element):
               defining the (left, bottom, right and top) edges.""")
 
 
+class ColumnData(object):
+    """
+    ColumnData holds tabular data in columnar form, as a list of
+    one-dimensional arrays with one array per key and value dimension
+    (in that order). It may be supplied to an NdElement in place of
+    the usual mapping of key tuples to value tuples, allowing large
+    tables to be stored and processed as arrays.
+    """
+
+    def __init__(self, columns):
+        self.columns = [np.asarray(column) for column in columns]
+        if len(set(len(column) for column in self.columns)) > 1:
+            raise ValueError("ColumnData columns must all have the same length.")
+
+
+    def take(self, indices):
+        """
+        Returns a new ColumnData containing the rows selected by the
+        supplied integer indices or boolean mask.
+        """
+        return ColumnData([column[indices] for column in self.columns])
+
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+
+
 class NdElement(Element, NdMapping):
     """
     An NdElement is an Element that stores the contained data as
@@ -179,6 +235,15 @@ class NdElement(Element, NdMapping):
     One feature of NdElements is that they support an additional level of
     index over NdMappings: the last index may be a column name or a
     slice over the column names (using alphanumeric ordering).
+
+    Alternatively the data may be supplied in columnar form as a
+    two-dimensional array with one column per key and value dimension
+    or as a ColumnData object. Columnar data is held as one array per
+    dimension and indexing, sampling, reindexing and conversion are
+    applied directly to these arrays. Accessing the .data attribute
+    returns the rows in the OrderedDict format, which is built once
+    and cached alongside the columns, while adding or removing items
+    converts the NdElement to the OrderedDict format.
     """
 
     group = param.String(default='NdElement', constant=True, doc="""
@@ -194,21 +259,149 @@ class NdElement(Element, NdMapping):
     _deep_indexable = False
 
     def __init__(self, data=None, **params):
-        if isinstance(data, Element):
+        columns = None
+        if isinstance(data, Element) and not isinstance(data, NdElement):
             data = data.table()
         elif isinstance(data, list) and all(np.isscalar(el) for el in data):
             data = OrderedDict(list(((k,), v) for k, v in enumerate(data)))
+        elif isinstance(data, np.ndarray):
+            if data.ndim == 1:
+                columns = ColumnData([np.arange(len(data)), data])
+            else:
+                columns = ColumnData(data.T)
+            data = None
+        elif isinstance(data, ColumnData):
+            columns, data = data, None
         super(NdElement, self).__init__(data, **params)
+        if columns is not None:
+            self._set_columns(columns)
+
+
+    @property
+    def data(self):
+        """
+        The data as an OrderedDict of key tuples to value tuples. Any
+        data held in columnar form is converted on first access and
+        the result is cached without discarding the columns.
+        """
+        columns = self._columns
+        if columns is not None and self._data is None:
+            self._data = OrderedDict(zip(self._column_keys(columns, True),
+                                         self._column_values(columns)))
+        return super(NdElement, self).data
+
+
+    @data.setter
+    def data(self, data):
+        if isinstance(data, ColumnData):
+            self._columns, data = data, None
+        else:
+            self._columns = None
+        NdMapping.data.fset(self, data)
+
+
+    def _set_columns(self, columns):
+        """
+        Validates the supplied ColumnData, applies the key dimension
+        types, sorts the rows by key and drops rows with duplicate
+        keys, keeping the last. Categorical key dimensions or
+        keys that cannot be sorted fall back to the OrderedDict format.
+        """
+        if len(columns.columns) != self.ndims + len(self.vdims):
+            raise ValueError("Data has to match number of key and value dimensions")
+        key_columns = []
+        for dim, column in zip(self.kdims, columns.columns):
+            if dim.type is not None:
+                try:
+                    column = column.astype(dim.type)
+                except (TypeError, ValueError):
+                    pass
+            key_columns.append(column)
+        columns = ColumnData(key_columns + columns.columns[self.ndims:])
+        try:
+            if any(d.values for d in self.kdims):
+                raise TypeError
+            order = np.lexsort(key_columns[::-1]) if key_columns else None
+        except TypeError:
+            self.update(OrderedDict(zip(self._column_keys(columns, True),
+                                        self._column_values(columns))))
+            return
+        if order is not None and (order[:-1] > order[1:]).any():
+            columns = columns.take(order)
+            key_columns = columns.columns[:self.ndims]
+        # Duplicate keys are dropped, keeping the last row as a dict would
+        if key_columns and len(columns) > 1:
+            last = np.zeros(len(columns), dtype=bool)
+            last[-1] = True
+            for column in key_columns:
+                last[:-1] |= column[1:] != column[:-1]
+            if not last.all():
+                columns = columns.take(last)
+        self.data = columns
+
+
+    def _column_keys(self, columns, tuples=False):
+        "Returns the keys of the supplied ColumnData as a list."
+        key_columns = [c.tolist() for c in columns.columns[:self.ndims]]
+        if self.ndims == 1 and not tuples:
+            return key_columns[0]
+        elif not key_columns:
+            return [()]*len(columns)
+        return list(zip(*key_columns))
+
+
+    def _column_values(self, columns):
+        "Returns the value tuples of the supplied ColumnData as a list."
+        value_columns = [c.tolist() for c in columns.columns[self.ndims:]]
+        return list(zip(*value_columns))
 
 
     def _convert_element(self, element):
         if isinstance(element, NdElement):
-            return element.data
+            return element._columns if element._columns is not None else element.data
         if isinstance(element, Element):
             return element.table().data
         else: return element
 
 
+    def __getstate__(self):
+        state = super(NdElement, self).__getstate__()
+        if state.get('_columns') is not None:
+            state['_data'] = None
+        return state
+
+
+    def __setstate__(self, d):
+        if 'data' in d:
+            d['_data'] = d.pop('data')
+        d.setdefault('_columns', None)
+        super(NdElement, self).__setstate__(d)
+
+
+    def clone(self, data=None, shared_data=True, *args, **overrides):
+        if data is None and shared_data and self._columns is not None:
+            data = self._columns
+        return super(NdElement, self).clone(data, shared_data, *args, **overrides)
+
+
+    def keys(self):
+        if self._columns is None:
+            return super(NdElement, self).keys()
+        return self._column_keys(self._columns)
+
+
+    def values(self):
+        if self._columns is None:
+            return super(NdElement, self).values()
+        return self._column_values(self._columns)
+
+
+    def __len__(self):
+        if self._columns is None:
+            return super(NdElement, self).__len__()
+        return len(self._columns)
+
+
     def reindex(self, kdims=None, vdims=None, force=False):
         """
         Create a new object with a re-ordered set of dimensions.
@@ -222,6 +415,9 @@ class NdElement(Element, NdMapping):
                 vdims = self._cached_value_names
         key_dims = [self.get_dimension(k) for k in kdims]
         val_dims = [self.get_dimension(v) for v in vdims]
+        if self._columns is not None:
+            columns = [self.dimension_values(d) for d in list(kdims) + list(vdims)]
+            return self.clone(ColumnData(columns), kdims=key_dims, vdims=val_dims)
         kidxs = [(i, k in self._cached_index_names, self.get_dimension_index(k))
                   for i, k in enumerate(kdims)]
         vidxs = [(i, v in self._cached_index_names, self.get_dimension_index(v))
@@ -238,6 +434,9 @@ class NdElement(Element, NdMapping):
 
 
     def _add_item(self, key, value, sort=True):
+        # Columnar data is converted before any items are added
+        if self._columns is not None:
+            self.data = self.data
         value = (value,) if np.isscalar(value) else tuple(value)
         if len(value) != len(self.vdims):
             raise ValueError("%s values must match value dimensions"
@@ -245,6 +444,12 @@ class NdElement(Element, NdMapping):
         super(NdElement, self)._add_item(key, value, sort)
 
 
+    def pop(self, key, default=None):
+        if self._columns is not None:
+            self.data = self.data
+        return super(NdElement, self).pop(key, default)
+
+
     def _filter_columns(self, index, col_names):
         "Returns the column names specified by index (which may be a slice)"
         if isinstance(index, slice):
@@ -277,8 +482,18 @@ class NdElement(Element, NdMapping):
         cols = self._filter_columns(vdims, col_names)
         indices = [col_names.index(col) for col in cols]
         vdims = [self.vdims[i] for i in indices]
-        items = [(k, tuple(v[i] for i in indices))
-                 for (k,v) in subtable.items()]
+        columns = getattr(subtable, '_columns', None)
+        if columns is not None:
+            ndims = subtable.ndims
+            if len(columns) != 1:
+                selected = columns.columns[:ndims] + [columns.columns[ndims+i]
+                                                      for i in indices]
+                return subtable.clone(ColumnData(selected), vdims=vdims)
+            items = [((), tuple(columns.columns[ndims+i][:1].tolist()[0]
+                                for i in indices))]
+        else:
+            items = [(k, tuple(v[i] for i in indices))
+                     for (k,v) in subtable.items()]
         if len(items) == 1:
             data = items[0][1]
             if len(vdims) == 1:
@@ -300,7 +515,10 @@ class NdElement(Element, NdMapping):
         by column name (or a slice over column names)
         """
         ndmap_index = args[:self.ndims] if isinstance(args, tuple) else args
-        subtable = NdMapping.__getitem__(self, ndmap_index)
+        if self._columns is None:
+            subtable = NdMapping.__getitem__(self, ndmap_index)
+        else:
+            subtable = self._getitem_columns(ndmap_index)
 
         if len(self.vdims) > 1 and not isinstance(subtable, NdElement):
             subtable = self.__class__([((), subtable)], label=self.label,
@@ -318,10 +536,89 @@ class NdElement(Element, NdMapping):
         return self._filter_data(subtable, args[-1])
 
 
+    def _getitem_columns(self, indexslice):
+        """
+        Equivalent to NdMapping.__getitem__ for data held in columnar
+        form, selecting rows using boolean masks over the key columns.
+        """
+        if indexslice in [Ellipsis, ()]:
+            return self
+        map_slice, _ = self._split_index(indexslice)
+        map_slice = self._transform_indices(map_slice)
+        if any(isinstance(el, slice) and el.step is not None for el in map_slice):
+            return NdMapping.__getitem__(self, indexslice)
+        scalar = all(not isinstance(el, (slice, set)) for el in map_slice)
+        if scalar and len(map_slice) < self.ndims:
+            # Partial scalar keys never match a row, as for dict data
+            raise KeyError(tuple(map_slice))
+
+        columns = self._columns
+        mask = np.ones(len(columns), dtype=bool)
+        for column, dim_slice in zip(columns.columns, map_slice):
+            if isinstance(dim_slice, slice):
+                start, stop = dim_slice.start, dim_slice.stop
+                if start is None and stop is None:
+                    continue
+                elif start is None:
+                    mask &= column < stop
+                elif stop is None:
+                    mask &= column > start
+                else:
+                    mask &= (column >= start) & (column < stop)
+            elif isinstance(dim_slice, set):
+                mask &= np.in1d(column, list(dim_slice))
+            elif dim_slice is Ellipsis:
+                continue
+            elif isinstance(dim_slice, (list, tuple)):
+                raise ValueError("Keys may only be selected with sets, not lists or tuples.")
+            else:
+                mask &= column == dim_slice
+
+        if scalar:
+            rows = np.flatnonzero(mask)
+            if not len(rows):
+                raise KeyError(map_slice)
+            return tuple(column[rows[-1:]].tolist()[0]
+                         for column in columns.columns[self.ndims:])
+        elif not mask.any():
+            raise KeyError('No items within specified slice.')
+        elif mask.all():
+            return self
+        return self.clone(columns.take(mask))
+
+
+    def _sample_rows(self, samples):
+        """
+        Looks up the row index of each sample key in columnar data by
+        bisecting the sorted key columns, raising a KeyError for any
+        sample that is not found.
+        """
+        key_columns = self._columns.columns[:self.ndims]
+        samples = [s if isinstance(s, tuple) else (s,) for s in samples]
+        queries = [np.asarray(q) for q in zip(*samples)] if samples else []
+        if len(queries) != self.ndims:
+            raise KeyError("Samples must match the number of key dimensions.")
+        if self.ndims == 1:
+            keys, query = key_columns[0], queries[0]
+        else:
+            keys = np.rec.fromarrays(key_columns)
+            query = np.rec.fromarrays(queries, dtype=keys.dtype)
+        rows = np.searchsorted(keys, query, 'right') - 1
+        found = rows >= 0
+        for column, q in zip(key_columns, queries):
+            found &= column[np.clip(rows, 0, None)] == q
+        if not found.all():
+            raise KeyError("Samples %s not found." % [s for s, f in zip(samples, found) if not f])
+        return rows
+
+
     def sample(self, samples=[]):
         """
         Allows sampling of the Table with a list of samples.
         """
+        if self._columns is not None:
+            rows = self._sample_rows(samples)
+            return self.clone(self._columns.take(rows))
         sample_data = OrderedDict()
         for sample in samples:
             sample_data[sample] = self[sample]
@@ -346,6 +643,10 @@ class NdElement(Element, NdMapping):
             dims = [dim for dim, _ in group]
             split_dims = [self.get_dimension(d) for d in dim_labels if d not in dims]
             if len(split_dims) and reduced_table.ndims > 1:
+                grouped = reduced_table._group_reduce(split_dims, reduce_fn)
+                if grouped is not None:
+                    reduced_table = grouped
+                    continue
                 split_map = reduced_table.groupby([d.name for d in split_dims], container_type=HoloMap,
                                                   group_type=self.__class__)
                 reduced_table = self.clone(shared_data=False, kdims=split_dims)
@@ -365,6 +666,61 @@ class NdElement(Element, NdMapping):
         return reduced_table
 
 
+    def _group_reduce(self, dimensions, function):
+        """
+        Groups the rows by the supplied key dimensions and reduces the
+        values in each group in a single pass over the value columns.
+        Returns None if the keys cannot be grouped, e.g. because they
+        are of mixed types.
+        """
+        try:
+            codes, ngroups, keys = factorize([self.dimension_values(d.name)
+                                              for d in dimensions])
+        except TypeError:
+            return None
+        columns = []
+        for vdim in self.vdims:
+            reduced = group_reduce(self.dimension_values(vdim.name),
+                                   codes, ngroups, function)
+            column = np.asarray(reduced)
+            if column.ndim != 1:
+                column = np.empty(ngroups, dtype=object)
+                for i, value in enumerate(reduced):
+                    column[i] = value
+            columns.append(column)
+        return self.clone(ColumnData(keys + columns), kdims=dimensions)
+
+
+    def groupby(self, dimensions, container_type=None, group_type=None, **kwargs):
+        """
+        Splits columnar data into groups along the supplied key
+        dimensions, selecting the rows of every group with a single
+        sort rather than a separate selection per group.
+        """
+        if self._columns is None or self.ndims == 1:
+            return super(NdElement, self).groupby(dimensions, container_type,
+                                                  group_type, **kwargs)
+        container_type = container_type if container_type else type(self)
+        group_type = group_type if group_type else type(self)
+        dims = [self.get_dimension(d) for d in dimensions]
+        idims = [d for d in self.kdims if d.name not in dimensions]
+        try:
+            codes, ngroups, keys = factorize([self.dimension_values(d.name)
+                                              for d in dims])
+        except TypeError:
+            return super(NdElement, self).groupby(dimensions, container_type,
+                                                  group_type, **kwargs)
+        order = np.argsort(codes, kind='mergesort')
+        splits = np.cumsum(np.bincount(codes, minlength=ngroups))[:-1]
+        columns = [self.dimension_values(d.name) for d in idims + self.vdims]
+        groups = []
+        for key, rows in zip(zip(*[k.tolist() for k in keys]), np.split(order, splits)):
+            subtable = self.clone(ColumnData([c[rows] for c in columns]), kdims=idims)
+            groups.append((key, group_type(subtable, **kwargs)))
+        with item_check(False):
+            return container_type(groups, kdims=dims)
+
+
     def _item_check(self, dim_vals, data):
         if isinstance(data, tuple):
             for el in data:
@@ -386,6 +742,13 @@ class NdElement(Element, NdMapping):
         if isinstance(dim, Dimension):
             raise Exception('Dimension to be specified by name')
         value_dims = self.dimensions('value', label=True)
+        if self._columns is not None:
+            if isinstance(dim, int):
+                dim = self.dimensions(label=True)[dim]
+            if dim in self._cached_index_names:
+                return self._columns.columns[self._cached_index_names.index(dim)]
+            elif dim in value_dims:
+                return self._columns.columns[self.ndims + value_dims.index(dim)]
         if dim in value_dims:
             index = value_dims.index(dim)
             return [v[index] for v in self.values()]
@@ -399,6 +762,9 @@ class NdElement(Element, NdMapping):
         except ImportError:
             raise Exception("Cannot build a DataFrame without the pandas library.")
         labels = [d.name for d in self.dimensions()]
+        if self._columns is not None:
+            return pandas.DataFrame(OrderedDict(zip(labels, self._columns.columns)),
+                                    columns=labels)
         return pandas.DataFrame(
             [dict(zip(labels, np.concatenate([np.array(k),v])))
              for (k, v) in self.data.items()])
@@ -424,6 +790,162 @@ class HoloMap(UniformNdMapping):
 
     data_type = (ViewableElement, UniformNdMapping)
 
+    @classmethod
+    def from_stack(cls, array, keys, kdims=None, element_type=None, **params):
+        """
+        Builds a HoloMap from an array of shape (frames, rows, cols)
+        or (frames, rows, cols, channels), or the path to such an
+        array stored as a .npy file, which is memory mapped. Each
+        frame is an Element of the supplied element_type (defaulting
+        to Image) holding a view onto the shared array, constructed
+        with the supplied params. The frames are only constructed when
+        the data of the HoloMap is first accessed; until then and as
+        long as the frames are not replaced, range operates on the
+        whole stack at once, as do collapse and sample for Raster
+        types.
+        """
+        if element_type is None:
+            from ..element import Image
+            element_type = Image
+        if isinstance(array, basestring):
+            array = np.load(array, mmap_mode='r')
+        if len(keys) != len(array):
+            raise ValueError("Number of keys (%d) does not match the number "
+                             "of frames in the stack (%d)." % (len(keys), len(array)))
+        map_params = {} if kdims is None else dict(kdims=kdims)
+        hmap = cls(**map_params)
+        keys = [hmap._apply_key_type(k if isinstance(k, tuple) else (k,)) for k in keys]
+        # The frames are held as indices into the stack until accessed
+        with item_check(False):
+            hmap = cls(zip(keys, range(len(array))), **map_params)
+        hmap._type = element_type
+        hmap._stack = (array, None)
+        hmap._stack_frames = (element_type, params)
+        return hmap
+
+
+    @property
+    def data(self):
+        """
+        The OrderedDict of key tuples to Elements. The frames of a
+        HoloMap built by from_stack are constructed on first access.
+        """
+        if getattr(self, '_stack_frames', None) is not None:
+            self._build_frames()
+        return UniformNdMapping.data.fget(self)
+
+
+    @data.setter
+    def data(self, data):
+        UniformNdMapping.data.fset(self, data)
+        self._stack_frames = None
+
+
+    def _build_frames(self):
+        """
+        Constructs the Elements of a HoloMap built by from_stack,
+        replacing the indices into the stack held in their place.
+        """
+        element_type, params = self._stack_frames
+        array = self._stack[0]
+        data = UniformNdMapping.data.fget(self)
+        in_order = list(data.values()) == list(range(len(array)))
+        data.update([(k, element_type(array[i], **params)) for k, i in data.items()])
+        self._stack_frames = None
+        if in_order:
+            self._stack = (array, [frame.data for frame in data.values()])
+        else:
+            self._stack = None
+
+
+    def _last_frame(self):
+        """
+        Returns the last Element, constructing only that frame if the
+        frames built by from_stack have not been accessed yet.
+        """
+        if getattr(self, '_stack_frames', None) is None:
+            return self.last
+        element_type, params = self._stack_frames
+        return element_type(self._stack[0][list(self._data.values())[-1]], **params)
+
+
+    @property
+    def ddims(self):
+        if getattr(self, '_stack_frames', None) is None:
+            return super(HoloMap, self).ddims
+        return self._last_frame().dimensions()
+
+
+    def __getstate__(self):
+        state = super(HoloMap, self).__getstate__()
+        # Once built the frames hold the data, which would otherwise
+        # be pickled a second time as part of the stack
+        if state.get('_stack_frames') is None:
+            state.pop('_stack', None)
+        return state
+
+
+    def _add_item(self, dim_vals, data, sort=True):
+        if getattr(self, '_stack_frames', None) is not None:
+            self._build_frames()
+        super(HoloMap, self)._add_item(dim_vals, data, sort)
+
+
+    def keys(self):
+        if getattr(self, '_stack_frames', None) is None:
+            return super(HoloMap, self).keys()
+        # Keys are sorted on construction and never added while pending
+        keys = list(self._data.keys())
+        return [k[0] for k in keys] if self.ndims == 1 else keys
+
+
+    def __len__(self):
+        return len(self._data)
+
+
+    def _get_stack(self):
+        """
+        Returns the array the frames were constructed from by
+        from_stack, or None if the frames no longer match it.
+        """
+        stack = getattr(self, '_stack', None)
+        if stack is None:
+            return None
+        array, frames = stack
+        if getattr(self, '_stack_frames', None) is not None:
+            # Sorting the keys may have reordered the frames
+            indices = list(self._data.values())
+            return array if indices == list(range(len(array))) else None
+        if len(frames) != len(self) or not all(el.data is data for el, data in
+                                               zip(self.data.values(), frames)):
+            return None
+        return array
+
+
+    def range(self, dimension, data_range=True):
+        from ..element.raster import Raster
+        stack = self._get_stack()
+        dim = self.get_dimension(dimension)
+        if (stack is None or not data_range or dim is None or
+            dim.range != (None, None)):
+            return super(HoloMap, self).range(dimension, data_range)
+        last = self._last_frame()
+        dims = last.kdims + last.vdims
+        if issubclass(self.type, Raster) and dim in last.vdims:
+            # The value dimensions of a Raster correspond to its channels
+            idx = last.vdims.index(dim)
+            stack = np.atleast_3d(stack.reshape((-1,)+stack.shape[2:]))
+        elif stack.ndim == 3 and stack.shape[2] == len(dims) and dim in dims:
+            # Other elements hold one column per key and value dimension
+            idx = dims.index(dim)
+            stack = stack.reshape(-1, 1, stack.shape[2])
+        else:
+            return super(HoloMap, self).range(dimension, data_range)
+        mins, maxs = array_range(stack)
+        soft_range = [r for r in dim.soft_range if r is not None]
+        return find_range((mins[idx], maxs[idx]), soft_range)
+
+
     def overlay(self, dimensions, **kwargs):
         """
         Splits the UniformNdMapping along a specified number of dimensions and
@@ -586,6 +1108,7 @@ class HoloMap(UniformNdMapping):
         supplying a function, inhomogenous elements are merged.
         """
         from .operation import MapOperation
+        from ..element.raster import Raster
         if not dimensions:
             dimensions = self._cached_index_names
         if self.ndims > 1 and len(dimensions) != self.ndims:
@@ -595,6 +1118,18 @@ class HoloMap(UniformNdMapping):
             [self.get_dimension(dim) for dim in dimensions]
             groups = HoloMap([(0, self)])
         collapsed = groups.clone(shared_data=False)
+        stack = self._get_stack()
+        if (len(groups) == 1 and stack is not None and issubclass(self.type, Raster)
+            and not isinstance(function, MapOperation)):
+            # Reductions that cannot be streamed over the frames are
+            # applied to the stack, avoiding a copy of all the frames
+            data = stream_reduce(list(stack), function, **kwargs)
+            if data is None and isinstance(function, np.ufunc):
+                data = function.reduce(stack, axis=0)
+            elif data is None:
+                data = function(stack, axis=0, **kwargs)
+            collapsed[list(groups.keys())[0]] = self._last_frame().clone(np.asarray(data))
+            return collapsed if self.ndims > 1 else collapsed.last
         for key, group in groups.items():
             if isinstance(function, MapOperation):
                 collapsed[key] = function(group, **kwargs)
@@ -619,10 +1154,11 @@ class HoloMap(UniformNdMapping):
         is the tuple (lower, upper) and the tuple (left, bottom,
         right, top) for 2D sampling.
         """
-        dims = self.last.ndims
+        last = self._last_frame()
+        dims = last.ndims
         if isinstance(samples, tuple) or np.isscalar(samples):
             if dims == 1:
-                xlim = self.last.range(0)
+                xlim = last.range(0)
                 lower, upper = (xlim[0], xlim[1]) if bounds is None else bounds
                 edges = np.linspace(lower, upper, samples+1)
                 linsamples = [(l+u)/2.0 for l,u in zip(edges[:-1], edges[1:])]
@@ -631,8 +1167,8 @@ class HoloMap(UniformNdMapping):
                 if bounds:
                     (l,b,r,t) = bounds
                 else:
-                    l, r = self.last.range(0)
-                    b, t = self.last.range(1)
+                    l, r = last.range(0)
+                    b, t = last.range(1)
 
                 xedges = np.linspace(l, r, cols+1)
                 yedges = np.linspace(b, t, rows+1)
@@ -645,13 +1181,44 @@ class HoloMap(UniformNdMapping):
                 raise NotImplementedError("Regular sampling not implented"
                                           "for high-dimensional Views.")
 
-            samples = set(self.last.closest(linsamples))
+            samples = set(last.closest(linsamples))
+
+        sample_frames = getattr(self.type, 'sample_frames', None)
+        if sample_frames and len(self) and not sample_values:
+            stack = self._get_stack()
+            # Frames which are yet to be built share the last one's layout
+            pending = getattr(self, '_stack_frames', None) is not None
+            frames = [last] if pending and stack is not None else list(self.data.values())
+            stacked = sample_frames(frames, samples, stack=stack)
+            if stacked is not None:
+                return self._stacked_table(*stacked)
 
         sampled = self.clone([(k, view.sample(samples, **sample_values))
                               for k, view in self.data.items()])
         return sampled.table()
 
 
+    def _stacked_table(self, coords, values):
+        """
+        Builds a Table from coordinates sampled across all Elements,
+        where values holds one array of shape (frames, samples) per
+        value dimension.
+        """
+        from ..element import Table
+        last = self._last_frame()
+        nsamples = len(coords[0])
+        keys = [k if isinstance(k, tuple) else (k,) for k in self.keys()]
+        key_columns = [np.repeat(np.array([k[i] for k in keys]), nsamples)
+                       for i in range(self.ndims)]
+        columns = (key_columns + [np.tile(c, len(keys)) for c in coords] +
+                   [v.ravel() for v in values])
+        params = dict(last.get_param_values(onlychanged=True),
+                      kdims=self.kdims + last.kdims, vdims=last.vdims)
+        params.pop('extents', None)
+        params.pop('bounds', None)
+        return Table(ColumnData(columns), **params)
+
+
     def reduce(self, dimensions=None, function=None, **reduce_map):
         """
         Reduce each Element in the HoloMap using a function supplied
@@ -685,10 +1252,18 @@ class HoloMap(UniformNdMapping):
         style_prefix = 'Custom[<' + self.name + '>]_'
         if issubclass(self.type, (NdOverlay, Overlay)) and 'index' not in kwargs:
             kwargs['index'] = 0
-        for k, v in self.data.items():
-            histmap[k] = v.hist(adjoin=False, bin_range=bin_range,
-                                individually=individually, num_bins=num_bins,
-                                style_prefix=style_prefix, **kwargs)
+        elif bin_range is not None:
+            # Shared bins allow all frames to be histogrammed at once
+            from ..operation import histogram
+            hists = histogram(self, adjoin=False, bin_range=bin_range,
+                              individually=individually, num_bins=num_bins,
+                              style_prefix=style_prefix, **kwargs)
+            histmap = self.clone(hists.items(), shared_data=False)
+        if not len(histmap):
+            for k, v in self.data.items():
+                histmap[k] = v.hist(adjoin=False, bin_range=bin_range,
+                                    individually=individually, num_bins=num_bins,
+                                    style_prefix=style_prefix, **kwargs)
 
         if adjoin and issubclass(self.type, (NdOverlay, Overlay)):
             layout = (self << histmap)
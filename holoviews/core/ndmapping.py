@@ -4,6 +4,7 @@ map types. The former class only allows indexing whereas the latter
 also enables slicing over multiple dimension ranges.
 """
 
+from bisect import bisect_left, bisect_right
 from operator import itemgetter
 import numpy as np
 
@@ -11,7 +12,8 @@ import param
 
 from . import traversal
 from .dimension import OrderedDict, Dimension, Dimensioned, ViewableElement
-from .util import unique_iterator, sanitize_identifier, dimension_sort, group_select, iterative_select
+from .util import (basestring, unique_iterator, sanitize_identifier, dimension_sort,
+                   group_select, iterative_select)
 
 
 class item_check(object):
@@ -102,6 +104,8 @@ class MultiDimensionalMapping(Dimensioned):
         super(MultiDimensionalMapping, self).__init__(OrderedDict(), **params)
 
         self._next_ind = 0
+        self._sorted_index = None
+        self._key_index_cache = None
         self._check_key_type = True
         self._cached_index_types = [d.type for d in self.kdims]
         self._cached_index_values = {d.name:d.values for d in self.kdims}
@@ -171,15 +175,24 @@ class MultiDimensionalMapping(Dimensioned):
                 raise KeyError('%s Dimension value %s not in'
                                ' specified Dimension values.' % (dim, repr(val)))
 
+        # Keys added without sorting bypass the index, so any pending
+        # reordering must be applied before the index goes stale
+        if not sort and self._unsorted:
+            self.data
+
         # Updates nested data structures rather than simply overriding them.
-        if ((dim_vals in self.data)
-            and isinstance(self.data[dim_vals], (NdMapping, OrderedDict))):
-            self.data[dim_vals].update(data)
+        # The unordered _data is used as the order is restored lazily
+        new_key = dim_vals not in self._data
+        if (not new_key
+            and isinstance(self._data[dim_vals], (NdMapping, OrderedDict))):
+            self._data[dim_vals].update(data)
         else:
-            self.data[dim_vals] = data
+            self._data[dim_vals] = data
 
-        if sort:
-            self._resort()
+        if new_key:
+            self._key_index_cache = None
+        if sort and new_key:
+            self._insert_key(dim_vals)
 
 
     def _apply_key_type(self, keys):
@@ -235,12 +248,107 @@ class MultiDimensionalMapping(Dimensioned):
         return data
 
 
+    def _sort_key(self, key):
+        """
+        Returns the value used to order the supplied key, replacing
+        the components along categorical dimensions with their
+        position in the declared Dimension values.
+        """
+        if not self._cached_categorical:
+            return key
+        return tuple(self._cached_index_values[d.name].index(k)
+                     if d.values else k for d, k in zip(self.kdims, key))
+
+
     def _resort(self):
-        if self._sorted:
+        """
+        Sorts all the items and rebuilds the sorted key index. If the
+        keys cannot be compared with each other (e.g. mixed types on
+        Python 3), the items are sorted in comparable groups and the
+        index is disabled.
+        """
+        if not self._sorted:
+            return
+        try:
+            index = sorted((self._sort_key(k), k) for k in self.data.keys())
+        except TypeError:
             resorted = dimension_sort(self.data, self.kdims,
                                       self._cached_categorical,
                                       self._cached_index_values)
             self.data = OrderedDict(resorted)
+            self._sorted_index = None
+        else:
+            self.data = OrderedDict((k, self.data[k]) for _, k in index)
+            self._sorted_index = index
+
+
+    @property
+    def data(self):
+        """
+        The OrderedDict of key tuples to values. Keys inserted out of
+        order are only moved into their sorted position when the data
+        is next accessed.
+        """
+        if self._unsorted:
+            self._unsorted = False
+            self._data = OrderedDict((k, self._data[k]) for _, k in self._sorted_index)
+        return self._data
+
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._unsorted = False
+
+
+    def __setstate__(self, d):
+        if 'data' in d:
+            d['_data'] = d.pop('data')
+        d.setdefault('_unsorted', False)
+        d.setdefault('_key_index_cache', None)
+        super(MultiDimensionalMapping, self).__setstate__(d)
+
+
+    def _insert_key(self, key):
+        """
+        Inserts a newly added key into the sorted key index using a
+        bisection, avoiding a full resort of the data. If the key does
+        not belong at the end, the data is only reordered when it is
+        next accessed, so building a mapping in any order costs a
+        single bisection per key. Falls back to a full resort if the
+        index is unavailable or out of sync with the data.
+        """
+        if not self._sorted:
+            return
+        index = getattr(self, '_sorted_index', None)
+        if index is None or len(index) != len(self._data)-1:
+            return self._resort()
+        entry = (self._sort_key(key), key)
+        try:
+            position = bisect_right(index, entry)
+        except TypeError:
+            return self._resort()
+        index.insert(position, entry)
+        if position != len(index)-1:
+            self._unsorted = True
+
+
+    def _remove_key(self, key):
+        """
+        Removes a key from the sorted key index.
+        """
+        index = getattr(self, '_sorted_index', None)
+        if index is None:
+            return
+        entry = (self._sort_key(key), key)
+        try:
+            position = bisect_left(index, entry)
+        except TypeError:
+            position = None
+        if position is not None and position < len(index) and index[position] == entry:
+            del index[position]
+        else:
+            self._sorted_index = None
 
 
     def clone(self, data=None, shared_data=True, *args, **overrides):
@@ -324,7 +432,8 @@ class MultiDimensionalMapping(Dimensioned):
             dimension = all_dims[dimension]
 
         if dimension in self._cached_index_names:
-            return [k[self.get_dimension_index(dimension)] for k in self.data.keys()]
+            idx = self.get_dimension_index(dimension)
+            return [k[idx] for k in self.data.keys()]
         elif dimension in all_dims:
             values = [el.dimension_values(dimension) for el in self
                       if dimension in el.dimensions()]
@@ -483,6 +592,9 @@ class MultiDimensionalMapping(Dimensioned):
     def pop(self, key, default=None):
         "Standard pop semantics for all mapping types"
         if not isinstance(key, tuple): key = (key,)
+        if key in self.data:
+            self._remove_key(key)
+            self._key_index_cache = None
         return self.data.pop(key, default)
 
 
@@ -552,12 +664,11 @@ class NdMapping(MultiDimensionalMapping):
         if all(not isinstance(el, (slice, set, list, tuple)) for el in map_slice):
             return self._dataslice(self.data[map_slice], data_slice)
         else:
-            conditions = self._generate_conditions(map_slice)
-            items = self.data.items()
-            for cidx, (condition, dim) in enumerate(zip(conditions, self.kdims)):
-                values = self._cached_index_values.get(dim.name, None)
-                items = [(k, v) for k, v in items
-                         if condition(values.index(k[cidx]) if values else k[cidx])]
+            keys = self._query_keys(map_slice)
+            if keys is None:
+                items = self._filter_items(map_slice)
+            else:
+                items = [(k, self.data[k]) for k in keys]
             items = [(k, self._dataslice(v, data_slice)) for k, v in items]
             if len(items) == 0:
                 raise KeyError('No items within specified slice.')
@@ -565,6 +676,131 @@ class NdMapping(MultiDimensionalMapping):
                 return self.clone(items)
 
 
+    def _filter_items(self, map_slice):
+        """
+        Filters the items by applying the conditions generated for
+        the supplied slice to each key in turn.
+        """
+        conditions = self._generate_conditions(map_slice)
+        items = self.data.items()
+        for cidx, (condition, dim) in enumerate(zip(conditions, self.kdims)):
+            values = self._cached_index_values.get(dim.name, None)
+            items = [(k, v) for k, v in items
+                     if condition(values.index(k[cidx]) if values else k[cidx])]
+        return items
+
+
+    def _key_index(self):
+        """
+        Returns a lazily computed index over the keys, consisting of
+        the list of keys and a sorted array of values along with the
+        sorting permutation for each key dimension. Categorical
+        dimensions are indexed by the position of each value in the
+        declared Dimension values. Returns None if any dimension cannot
+        be indexed, e.g. because it holds values of mixed types.
+        """
+        cache = self._key_index_cache
+        if cache is not None and cache[0] is self.data and cache[1] == len(self.data):
+            return cache[2]
+
+        keys = list(self.data.keys())
+        columns = []
+        try:
+            for idx, dim in enumerate(self.kdims):
+                if dim.values:
+                    positions = {v: i for i, v in
+                                 enumerate(self._cached_index_values[dim.name])}
+                    column = np.array([positions[k[idx]] for k in keys], dtype=int)
+                else:
+                    values = [k[idx] for k in keys]
+                    column = np.array(values)
+                    if column.dtype.kind in 'US':
+                        if not all(isinstance(v, basestring) for v in values):
+                            raise TypeError
+                    elif column.dtype.kind not in 'biuf':
+                        raise TypeError
+                    elif column.dtype.kind == 'f' and np.isnan(column).any():
+                        raise TypeError
+                if column.ndim != 1:
+                    raise TypeError
+                perm = np.argsort(column, kind='mergesort')
+                columns.append((column[perm], perm))
+            index = (keys, columns)
+        except (KeyError, TypeError, ValueError):
+            index = None
+        self._key_index_cache = (self.data, len(self.data), index)
+        return index
+
+
+    def _query_keys(self, map_slice):
+        """
+        Looks up the keys matching the supplied slice using the key
+        index, bisecting the sorted values along each dimension and
+        intersecting the matching positions. Returns the matching keys
+        in their original order or None if the index is not available.
+        """
+        index = self._key_index()
+        if index is None:
+            return None
+        keys, columns = index
+        selected = None
+        try:
+            for dim, dim_slice, (column, perm) in zip(self.kdims, map_slice, columns):
+                positions = self._query_dimension(dim, dim_slice, column, perm)
+                if positions is None:
+                    continue
+                elif selected is None:
+                    selected = np.sort(positions)
+                else:
+                    selected = np.intersect1d(selected, positions, assume_unique=True)
+        except (TypeError, ValueError):
+            return None
+        if selected is None:
+            return keys
+        return [keys[i] for i in selected]
+
+
+    def _query_dimension(self, dim, dim_slice, column, perm):
+        """
+        Returns the positions of the keys matching the slice along a
+        single dimension, or None if all keys match. Matches the
+        semantics of the conditions returned by _generate_conditions.
+        """
+        values = self._cached_index_values[dim.name] if dim.values else None
+        if isinstance(dim_slice, slice):
+            start, stop = dim_slice.start, dim_slice.stop
+            if values:
+                start = None if start is None else values.index(start)
+                stop = None if stop is None else values.index(stop)
+            if start is None and stop is None:
+                return None
+            elif start is None:
+                lower, upper = 0, np.searchsorted(column, stop, 'left')
+            elif stop is None:
+                lower, upper = np.searchsorted(column, start, 'right'), len(column)
+            else:
+                lower = np.searchsorted(column, start, 'left')
+                upper = np.searchsorted(column, stop, 'left')
+            return perm[lower:max(lower, upper)]
+        elif isinstance(dim_slice, set):
+            if values:
+                dim_slice = [values.index(v) for v in dim_slice]
+            bounds = [(np.searchsorted(column, v, 'left'),
+                       np.searchsorted(column, v, 'right')) for v in dim_slice]
+            return np.concatenate([perm[l:u] for l, u in bounds] +
+                                  [np.array([], dtype=perm.dtype)])
+        elif dim_slice is Ellipsis:
+            return None
+        elif isinstance(dim_slice, (list, tuple)):
+            raise ValueError
+        else:
+            if values:
+                dim_slice = values.index(dim_slice)
+            lower = np.searchsorted(column, dim_slice, 'left')
+            upper = np.searchsorted(column, dim_slice, 'right')
+            return perm[lower:upper]
+
+
     def _expand_slice(self, indices):
         """
         Expands slices containing steps into a list.
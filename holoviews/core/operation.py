@@ -2,12 +2,21 @@
 Operations manipulate Elements, HoloMaps and Layouts, typically for
 the purposes of analysis or visualization.
 """
-from functools import reduce
+import sys
+import hashlib
+import pickle
+from functools import reduce, partial
+from itertools import groupby
+from multiprocessing import cpu_count, Pool
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
 import param
 
 from .dimension import ViewableElement
 from .element import Element, HoloMap, GridSpace, Collator
 from .layout import Layout
+from .ndmapping import OrderedDict
 from .overlay import NdOverlay, Overlay
 from .traversal import unique_dimkeys
 
@@ -65,6 +74,153 @@ class Operation(param.ParameterizedFunction):
 
 
 
+class OperationCache(param.Parameterized):
+    """
+    A least recently used cache of ElementOperation results, keyed
+    by a fingerprint of the operation type, its resolved parameter
+    values, the key of the processed element and the content of the
+    element. The least recently used results are evicted once the
+    total size of the cached data exceeds max_bytes.
+    """
+
+    max_bytes = param.Integer(default=256*1024**2, bounds=(0, None), doc="""
+       The maximum total number of bytes of data held by the cached
+       results.""")
+
+    # Parameters that control how an operation is executed but
+    # do not affect its result.
+    _ignored = ['name', 'cache', 'executor', 'workers', 'chunksize']
+
+    def __init__(self, **params):
+        super(OperationCache, self).__init__(**params)
+        self.clear()
+
+
+    def clear(self):
+        """
+        Clears all cached results and resets the statistics.
+        """
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+
+    def stats(self):
+        """
+        Returns a dictionary of the number of hits and misses along
+        with the number and total size in bytes of the cached results.
+        """
+        return dict(hits=self.hits, misses=self.misses,
+                    entries=len(self._entries), nbytes=self.nbytes)
+
+
+    @classmethod
+    def _normalize(cls, value):
+        """
+        Converts a parameter value into a canonical form, so that
+        equal mappings pickle identically regardless of their type.
+        """
+        if isinstance(value, dict):
+            return sorted((repr(k), cls._normalize(v)) for k, v in value.items())
+        elif isinstance(value, (list, tuple)):
+            return [cls._normalize(v) for v in value]
+        return value
+
+
+    @classmethod
+    def _hash_array(cls, array, digest):
+        digest.update(pickle.dumps((array.shape, array.dtype.str), protocol=2))
+        digest.update(np.ascontiguousarray(array).view(np.uint8))
+
+
+    @classmethod
+    def _hash_data(cls, obj, digest):
+        """
+        Updates the digest with the type, the parameters affecting
+        the output (i.e. all but the name) and the data of the object.
+        Columnar data is hashed without converting it.
+        """
+        if hasattr(obj, 'get_param_values'):
+            params = [(k, cls._normalize(v)) for k, v in obj.get_param_values()
+                      if k != 'name']
+            digest.update(pickle.dumps((type(obj).__name__, params), protocol=2))
+        else:
+            digest.update(pickle.dumps(type(obj).__name__, protocol=2))
+        columns = getattr(obj, '_columns', None)
+        data = getattr(obj, 'data', obj) if columns is None else None
+        if columns is not None:
+            for column in columns.columns:
+                cls._hash_array(column, digest)
+        elif isinstance(data, np.ndarray):
+            cls._hash_array(data, digest)
+        elif isinstance(data, dict) and all(hasattr(v, 'data') for v in data.values()):
+            digest.update(pickle.dumps(list(data.keys()), protocol=2))
+            for value in data.values():
+                cls._hash_data(value, digest)
+        else:
+            digest.update(pickle.dumps(data, protocol=2))
+
+
+    def fingerprint(self, operation, element, key=None):
+        """
+        Returns the cache key for the given operation applied to the
+        element, or None if the parameters or the element cannot be
+        fingerprinted.
+        """
+        values = [(name, getattr(operation.p, name)) for name in sorted(operation.params())
+                  if name not in self._ignored]
+        digest = hashlib.sha1()
+        try:
+            digest.update(pickle.dumps((type(operation).__module__, type(operation).__name__,
+                                        values, key), protocol=2))
+            self._hash_data(element, digest)
+        except Exception:
+            return None
+        return digest.hexdigest()
+
+
+    @classmethod
+    def _nbytes(cls, obj):
+        data = getattr(obj, 'data', obj)
+        if isinstance(data, np.ndarray):
+            return data.nbytes
+        elif isinstance(data, dict):
+            return sys.getsizeof(data) + sum(cls._nbytes(v) for v in data.values())
+        return sys.getsizeof(data)
+
+
+    def get(self, fingerprint):
+        """
+        Returns the cached result for the fingerprint, or None if it
+        is not in the cache.
+        """
+        if fingerprint not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        result, nbytes = self._entries.pop(fingerprint)
+        self._entries[fingerprint] = (result, nbytes)
+        return result
+
+
+    def set(self, fingerprint, result):
+        """
+        Caches the result under the fingerprint, evicting the least
+        recently used results to stay within the byte budget.
+        """
+        nbytes = self._nbytes(result)
+        if fingerprint in self._entries:
+            self.nbytes -= self._entries.pop(fingerprint)[1]
+        if nbytes <= self.max_bytes:
+            self._entries[fingerprint] = (result, nbytes)
+            self.nbytes += nbytes
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+
+
+
 class ElementOperation(Operation):
     """
     An ElementOperation process an Element or HoloMap at the level of
@@ -84,6 +240,39 @@ class ElementOperation(Operation):
        first component is a Normalization.ranges list and the second
        component is Normalization.keys. """)
 
+    executor = param.ObjectSelector(default='serial', objects=['serial', 'thread', 'process'], doc="""
+       The execution policy used to process the elements of a HoloMap
+       or the cells of a GridSpace. The 'thread' and 'process' policies
+       process chunks of elements concurrently using a thread or process
+       pool, preserving the order of the keys. The 'process' policy
+       requires the operation and elements to be picklable.""")
+
+    workers = param.Integer(default=None, allow_None=True, bounds=(1, None), doc="""
+       The number of workers in the pool, defaulting to the number of
+       processors on the machine.""")
+
+    chunksize = param.Integer(default=1, bounds=(1, None), doc="""
+       The number of elements submitted to a worker at a time. Larger
+       chunks reduce the overhead of sending the operation to the
+       workers when processing many small elements.""")
+
+    cache = param.Boolean(default=False, doc="""
+       Whether to look up and store results in the result_cache,
+       shared by all ElementOperations. Results are keyed by the
+       operation, its parameter values and the content of the input
+       element, so repeatedly applying an operation to the same data
+       returns the cached result.""")
+
+    result_cache = OperationCache()
+
+    # Whether the operation implements _process_array, transforming
+    # array data pointwise and in place.
+    pointwise = False
+
+    # Whether the result for each element of a HoloMap depends only on
+    # that element, allowing a Deferred graph to be evaluated per frame.
+    elementwise = True
+
 
     def _process(self, view, key=None):
         """
@@ -95,31 +284,115 @@ class ElementOperation(Operation):
         raise NotImplementedError
 
 
+    def _process_array(self, element, data, key=None):
+        """
+        Pointwise operations implement this method to apply the
+        operation in place to the supplied array, which holds the data
+        of the given element, returning the result. This allows chains
+        of consecutive pointwise operations to be fused into a single
+        buffer.
+        """
+        raise NotImplementedError
+
+
+    def _clone_array(self, element, data):
+        """
+        Returns the element holding the data computed by
+        _process_array, assigning the same metadata as _process.
+        """
+        return element.clone(data)
+
+
     def process_element(self, element, key, **params):
         """
         The process_element method allows a single element to be
         operated on given an externally supplied key.
         """
         self.p = param.ParamOverrides(self, params)
-        return self._process(element, key)
+        return self._map_process([(key, element)], params)[0]
+
+
+    def process_array(self, element, data, key, **params):
+        """
+        The process_array method allows a pointwise operation to be
+        applied in place to an array holding the data of an element,
+        given an externally supplied key.
+        """
+        self.p = param.ParamOverrides(self, params)
+        return self._process_array(element, data, key)
+
+
+    def __reduce__(self):
+        # The parameter overrides are recreated from the call parameters
+        # when the operation is sent to worker processes.
+        new, args, state = super(ElementOperation, self).__reduce__()
+        state.pop('p', None)
+        return new, args, state
+
+
+    def _map_process(self, items, params):
+        """
+        Processes a list of (key, element) pairs according to the
+        executor policy, returning the processed elements in order.
+        If caching is enabled, only the elements missing from the
+        result_cache are processed.
+        """
+        cache = self.result_cache
+        if self.p.cache:
+            fingerprints = [cache.fingerprint(self, el, k) for k, el in items]
+        else:
+            fingerprints = [None] * len(items)
+        results = [None if fp is None else cache.get(fp) for fp in fingerprints]
+        results = [None if r is None else r.clone() for r in results]
+        pending = [i for i, r in enumerate(results) if r is None]
+        pending_items = [items[i] for i in pending]
+
+        if self.p.executor == 'serial' or len(pending_items) < 2:
+            processed = [self._process(el, key=k) for k, el in pending_items]
+        else:
+            pool_type = ThreadPool if self.p.executor == 'thread' else Pool
+            workers = self.p.workers if self.p.workers else cpu_count()
+            size = self.p.chunksize
+            chunks = [pending_items[i:i+size] for i in range(0, len(pending_items), size)]
+            pool = pool_type(workers)
+            try:
+                chunks = pool.map(partial(_process_chunk, self, params), chunks)
+            finally:
+                pool.close()
+                pool.join()
+            processed = [el for chunk in chunks for el in chunk]
+
+        for i, result in zip(pending, processed):
+            if fingerprints[i] is not None:
+                cache.set(fingerprints[i], result)
+            results[i] = result
+        return results
 
 
     def __call__(self, element, **params):
+        if isinstance(element, Deferred):
+            return element.apply(self, params)
         self.p = param.ParamOverrides(self, params)
 
         if isinstance(element, ViewableElement):
-            processed = self._process(element)
+            processed = self._map_process([(None, element)], params)[0]
         elif isinstance(element, GridSpace):
             # Initialize an empty axis layout
             processed = GridSpace(None, label=element.label,
                                   kdims=element.kdims)
+            cells = list(element.items())
+            if all(isinstance(cell, ViewableElement) for _, cell in cells):
+                results = self._map_process([(None, cell) for _, cell in cells], params)
+            else:
+                results = [self(cell, **params) for _, cell in cells]
             # Populate the axis layout
-            for pos, cell in element.items():
-                processed[pos] = self(cell, **params)
+            for (pos, _), result in zip(cells, results):
+                processed[pos] = result
         elif isinstance(element, HoloMap):
-            mapped_items = [(k, self._process(el, key=k))
-                            for k, el in element.items()]
-            refval = mapped_items[0][1]
+            items = list(element.items())
+            mapped_items = list(zip([k for k, _ in items],
+                                    self._map_process(items, params)))
+            refval = mapped_items[0][1] if mapped_items else element
             processed = element.clone(mapped_items,
                                       group=refval.group,
                                       label=refval.label)
@@ -129,6 +402,117 @@ class ElementOperation(Operation):
 
 
 
+def _apply_operations(element, key, operations):
+    """
+    Applies a list of (operation, params) pairs to an element in
+    turn. Consecutive pointwise operations on Raster data are fused:
+    the data is copied once into a float buffer, which each of the
+    operations then updates in place.
+    """
+    from ..element.raster import Raster
+    processed, buffer = element, None
+    for operation, params in operations:
+        if not (operation.pointwise and isinstance(processed, Raster) and
+                isinstance(processed.data, np.ndarray)):
+            processed, buffer = operation.process_element(processed, key, **params), None
+            continue
+        if buffer is None:
+            buffer = np.array(processed.data, dtype=np.float64)
+            processed = processed.clone(buffer)
+        buffer = operation.process_array(processed, buffer, key, **params)
+        processed = operation._clone_array(processed, buffer)
+    return processed
+
+
+
+class Deferred(object):
+    """
+    A node in a deferred graph of ElementOperations. Applying an
+    ElementOperation to a Deferred object records the operation and
+    its parameters in a new node instead of computing the result,
+    so that for example:
+
+    graph = threshold(gradient(raster_normalization(Deferred(hmap))))
+
+    only builds the graph, which is computed when evaluate is
+    called. Consecutive pointwise operations are fused into a single
+    buffer and on a HoloMap the whole graph is applied frame by
+    frame, so intermediate frames are never stored. Operations that
+    are not elementwise (e.g. aggregate) are applied to the HoloMap
+    of the frames computed up to that point.
+
+    Note that a Deferred object cannot be displayed directly, since
+    the plotting classes require all the frames up front to compute
+    the ranges. To display the result it has to be computed first,
+    either as a whole using evaluate() or one frame at a time using
+    evaluate(key).
+    """
+
+    def __init__(self, source, operation=None, params={}):
+        self.source = source
+        self.operation = operation
+        self.params = dict(params)
+
+
+    def apply(self, operation, params):
+        """
+        Returns a new node applying the operation with the supplied
+        parameters to the output of this node.
+        """
+        return Deferred(self, operation, params)
+
+
+    def graph(self):
+        """
+        Returns the input object of the graph and the list of
+        (operation, params) pairs applied to it, in order.
+        """
+        node, operations = self, []
+        while isinstance(node, Deferred):
+            if node.operation is not None:
+                operations.insert(0, (node.operation, node.params))
+            node = node.source
+        return node, operations
+
+
+    def evaluate(self, key=None):
+        """
+        Computes the result of the graph. If the input is a HoloMap,
+        a key may be supplied to compute only the corresponding frame.
+        """
+        result, operations = self.graph()
+        if key is not None:
+            if isinstance(result, HoloMap) and all(op.elementwise for op, _ in operations):
+                if not isinstance(key, tuple): key = (key,)
+                return _apply_operations(result[key], key, operations)
+            return self.evaluate()[key]
+        stages = [(elementwise, list(ops)) for elementwise, ops in
+                  groupby(operations, lambda op: op[0].elementwise)]
+        for elementwise, ops in stages:
+            if elementwise and isinstance(result, HoloMap):
+                items = [(k, _apply_operations(el, k, ops)) for k, el in result.items()]
+                refval = items[0][1] if items else result
+                result = result.clone(items, group=refval.group,
+                                      label=refval.label)
+            elif elementwise and isinstance(result, ViewableElement):
+                result = _apply_operations(result, None, ops)
+            else:
+                for operation, params in ops:
+                    result = operation(result, **params)
+        return result
+
+
+
+def _process_chunk(operation, params, items):
+    """
+    Processes a chunk of (key, element) pairs in a worker, applying
+    the parameters the operation was called with.
+    """
+    operation.p = param.ParamOverrides(operation, params)
+    return [operation._process(el, key=k) for k, el in items]
+
+
+
 class MapOperation(param.ParameterizedFunction):
     """
     A MapOperation takes a HoloMap containing elements or overlays and
@@ -277,6 +277,52 @@ def max_range(ranges):
       return (np.NaN, np.NaN)
 
 
+def array_range(array, chunk_size=2**22):
+    """
+    Computes the NaN-aware minimum and maximum of a 2D or 3D array,
+    returning the range of each channel for 3D arrays. The array is
+    processed in blocks of rows containing roughly chunk_size
+    elements, so memory mapped arrays are never loaded into memory
+    in full.
+    """
+    row_size = int(np.prod(array.shape[1:2]))
+    rows = max(chunk_size // max(row_size, 1), 1)
+    mins, maxs = [], []
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', r'All-NaN (slice|axis) encountered')
+        for i in range(0, len(array), rows):
+            chunk = np.asarray(array[i:i+rows])
+            mins.append(np.nanmin(chunk, axis=(0, 1)))
+            maxs.append(np.nanmax(chunk, axis=(0, 1)))
+        return np.nanmin(mins, axis=0), np.nanmax(maxs, axis=0)
+
+
+def block_mean(array, chunk_size=2**22):
+    """
+    Downsamples a 2D or 3D array by a factor of two along the first
+    two axes, averaging each 2x2 block while ignoring NaNs. Arrays
+    with an odd number of rows or columns are padded with NaNs. The
+    array is processed in blocks of rows containing roughly
+    chunk_size elements and integer arrays retain their dtype.
+    """
+    rows, cols = array.shape[:2]
+    channels = array.shape[2:]
+    out = np.empty(((rows+1)//2, (cols+1)//2) + channels)
+    step = max(chunk_size // max(cols * int(np.prod(channels)), 1) // 2 * 2, 2)
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', r'Mean of empty slice')
+        for i in range(0, rows, step):
+            block = np.asarray(array[i:i+step], dtype=np.float)
+            padded = np.full((block.shape[0] + block.shape[0] % 2,
+                              cols + cols % 2) + channels, np.NaN)
+            padded[:block.shape[0], :cols] = block
+            padded = padded.reshape((padded.shape[0]//2, 2, padded.shape[1]//2, 2) + channels)
+            out[i//2:(i+step)//2] = np.nanmean(padded, axis=(1, 3))
+    if array.dtype.kind in 'iu':
+        return np.round(out).astype(array.dtype)
+    return out
+
+
 def max_extents(extents, zrange=False):
    """
    Computes the maximal extent in 2D and 3D space from
@@ -406,6 +452,155 @@ def dimension_sort(odict, dimensions, categorical, cached_values):
         return sorted(odict.items(), **sortkws)
 
 
+def factorize(columns):
+    """
+    Assigns an integer group index to each row of the supplied list
+    of equal length columns, where rows with identical values across
+    all columns belong to the same group. Returns the group index of
+    each row, the number of groups and the list of columns holding
+    the unique values of each group in sorted order.
+    """
+    codes = None
+    for column in columns:
+        _, inverse = np.unique(column, return_inverse=True)
+        if codes is None:
+            codes = inverse
+        else:
+            combined = codes * (inverse.max()+1 if len(inverse) else 1) + inverse
+            _, codes = np.unique(combined, return_inverse=True)
+    _, first = np.unique(codes, return_index=True)
+    return codes, len(first), [np.asarray(column)[first] for column in columns]
+
+
+_group_reductions = [(np.sum, 'sum'), (sum, 'sum'), (np.mean, 'mean'),
+                     (np.min, 'min'), (np.amin, 'min'), (min, 'min'),
+                     (np.max, 'max'), (np.amax, 'max'), (max, 'max'),
+                     (np.std, 'std'), (np.var, 'var'), (len, 'count')]
+
+
+def group_reduce(values, codes, ngroups, function):
+    """
+    Applies the reduction function to the values in each group
+    defined by the group indices returned by factorize. Common
+    reductions (sum, mean, min, max, std, var and len) are computed
+    for all groups at once using np.bincount and ufunc.reduceat,
+    while any other function is called on each group in turn.
+    """
+    values = np.asarray(values)
+    reduction = [name for fn, name in _group_reductions if fn is function]
+    counts = np.bincount(codes, minlength=ngroups)
+    if reduction and values.dtype.kind in 'biuf' and values.ndim == 1:
+        reduction = reduction[0]
+        if reduction == 'count':
+            return counts
+        elif reduction in ['min', 'max']:
+            order = np.argsort(codes, kind='mergesort')
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            ufunc = np.minimum if reduction == 'min' else np.maximum
+            return ufunc.reduceat(values[order], starts)
+        sums = np.bincount(codes, weights=values, minlength=ngroups)
+        if reduction == 'sum':
+            # Integer and boolean sums take the dtype np.sum would return
+            return sums if values.dtype.kind == 'f' else sums.astype(np.sum(values[:0]).dtype)
+        means = sums / counts
+        if reduction == 'mean':
+            return means
+        deviations = values - means[codes]
+        variance = np.bincount(codes, weights=deviations**2, minlength=ngroups) / counts
+        return variance if reduction == 'var' else np.sqrt(variance)
+    order = np.argsort(codes, kind='mergesort')
+    groups = np.split(values[order], np.cumsum(counts)[:-1])
+    return [function(group) for group in groups]
+
+
+_stream_reductions = _group_reductions + [(np.add, 'sum'), (np.minimum, 'min'),
+                                          (np.maximum, 'max')]
+
+
+def stream_reduce(arrays, function, **kwargs):
+    """
+    Reduces a sequence of equally shaped arrays elementwise,
+    accumulating each array into a single output buffer instead of
+    stacking them. Supports sum, mean, min, max and var and std
+    (computed with Welford's algorithm, accepting a ddof keyword).
+    Returns None if the function or keywords are not supported.
+    """
+    reduction = [name for fn, name in _stream_reductions if fn is function]
+    if not reduction or reduction[0] == 'count':
+        return None
+    reduction = reduction[0]
+    if set(kwargs) - (set(['ddof']) if reduction in ['var', 'std'] else set()):
+        return None
+    arrays = iter(arrays)
+    first = np.asarray(next(arrays))
+    if first.dtype.kind not in 'biuf':
+        return None
+    if reduction in ['min', 'max']:
+        ufunc = np.minimum if reduction == 'min' else np.maximum
+        out = np.array(first)
+        for array in arrays:
+            ufunc(out, array, out=out)
+        return out
+    elif reduction == 'sum':
+        dtype = {'b': np.int_, 'i': np.int_, 'u': np.uint}.get(first.dtype.kind, first.dtype)
+        out = np.array(first, dtype=dtype)
+        for array in arrays:
+            np.add(out, array, out=out)
+        return out
+    mean = np.array(first, dtype=np.float64)
+    m2 = np.zeros_like(mean) if reduction in ['var', 'std'] else None
+    delta, scratch = np.empty_like(mean), np.empty_like(mean)
+    count = 1
+    for array in arrays:
+        count += 1
+        np.subtract(array, mean, out=delta)
+        np.multiply(delta, 1./count, out=scratch)
+        mean += scratch
+        if m2 is not None:
+            np.subtract(array, mean, out=scratch)
+            scratch *= delta
+            m2 += scratch
+    dtype = first.dtype if first.dtype.kind == 'f' else np.float64
+    if reduction == 'mean':
+        return mean.astype(dtype, copy=False)
+    m2 /= (count - kwargs.get('ddof', 0))
+    if reduction == 'std':
+        np.sqrt(m2, out=m2)
+    return m2.astype(dtype, copy=False)
+
+
+_axis_reductions = {'sum': (np.sum, np.nansum), 'mean': (np.mean, np.nanmean),
+                    'min': (np.min, np.nanmin), 'max': (np.max, np.nanmax),
+                    'std': (np.std, np.nanstd), 'var': (np.var, np.nanvar)}
+
+
+def axis_reduce(array, function, axis=0, skip_nan=False):
+    """
+    Applies the reduction function along the given axis of the
+    array. Common reductions (including the Python builtins) are
+    mapped onto the equivalent numpy function or its NaN-aware
+    variant if skip_nan is set. Any other function is called with
+    the axis keyword if it accepts it and otherwise on each slice
+    along the axis, with NaNs dropped if skip_nan is set.
+    """
+    array = np.asarray(array)
+    reduction = [name for fn, name in _group_reductions if fn is function]
+    if reduction and reduction[0] == 'count':
+        return (~np.isnan(array) if skip_nan else np.ones(array.shape, int)).sum(axis=axis)
+    elif reduction:
+        return _axis_reductions[reduction[0]][int(skip_nan)](array, axis=axis)
+    elif not skip_nan:
+        try:
+            return function(array, axis=axis)
+        except TypeError:
+            pass
+    slices = np.rollaxis(array, axis).reshape(array.shape[axis], -1).T
+    if skip_nan:
+        slices = [s[~np.isnan(s)] for s in slices]
+    reduced = np.array([function(s) for s in slices])
+    return reduced.reshape(array.shape[:axis] + array.shape[axis+1:])
+
+
 # Copied from param should make param version public
 def is_number(obj):
     if isinstance(obj, numbers.Number): return True
@@ -1,3 +1,5 @@
+import numbers
+
 import numpy as np
 
 import param
@@ -31,19 +33,22 @@ class Chart(Element2D):
 
     _null_value = np.array([[], []]).T # For when data is None
 
+    _cache_attributes = Element2D._cache_attributes + ['_x_sorting']
+
     def __init__(self, data, **kwargs):
         data, params = self._process_data(data)
         params.update(kwargs)
         super(Chart, self).__init__(data, **params)
         self.data = self._validate_data(self.data)
+        self._x_sorting = None
 
 
     def _convert_element(self, element):
         if isinstance(element, Chart):
             return element.data
         elif isinstance(element, NdElement):
-            return np.vstack([np.concatenate([key, vals])
-                              for key, vals in element.data.items()]).astype(np.float)
+            return np.column_stack([element.dimension_values(d.name)
+                                    for d in element.kdims + element.vdims]).astype(np.float)
         else:
             return super(Chart, self)._convert_element(element)
 
@@ -81,9 +86,47 @@ class Chart(Element2D):
         of closest actual samples.
         """
         if not isinstance(coords, list): coords = [coords]
+        _, xs = self._sorted_xs()
+        if len(xs) < 2:
+            return [xs[0] for coord in coords]
+        coords = np.asarray(coords, dtype=np.float)
+        idxs = np.clip(np.searchsorted(xs, coords), 1, len(xs)-1)
+        idxs -= (coords - xs[idxs-1]) <= (xs[idxs] - coords)
+        return list(xs[idxs])
+
+
+    def _sorted_xs(self):
+        """
+        Returns the permutation sorting the data along the first
+        dimension (None if it is already sorted) and the sorted
+        x-values. The result is cached until the data is replaced.
+        """
+        sorting = getattr(self, '_x_sorting', None)
+        if sorting is not None and sorting[0] is self.data:
+            return sorting[1:]
         xs = self.data[:, 0]
-        idxs = [np.argmin(np.abs(xs-coord)) for coord in coords]
-        return [xs[idx] for idx in idxs]
+        if len(xs) < 2 or np.all(xs[1:] >= xs[:-1]):
+            order = None
+        else:
+            order = np.argsort(xs, kind='mergesort')
+            xs = xs[order]
+        self._x_sorting = (self.data, order, xs)
+        return order, xs
+
+
+    def _x_rows(self, lower, upper, side='left'):
+        """
+        Returns the rows with x-values in the half-open interval
+        [lower, upper) (or the closed interval if side is 'right')
+        as a view on the data if it is sorted along x, and otherwise
+        as a copy preserving the original order of the rows.
+        """
+        order, xs = self._sorted_xs()
+        start = np.searchsorted(xs, lower, side='left')
+        stop = np.searchsorted(xs, upper, side=side)
+        if order is None:
+            return self.data[start:stop]
+        return self.data[np.sort(order[start:stop])]
 
 
     def __getitem__(self, slices):
@@ -105,13 +148,20 @@ class Chart(Element2D):
                 start = slc.start if slc.start else -float("inf")
                 stop = slc.stop if slc.stop else float("inf")
 
-                clip_start = start <= data[:, idx]
-                clip_stop = data[:, idx] < stop
-                data = data[np.logical_and(clip_start, clip_stop), :]
+                if idx == 0:
+                    data = self._x_rows(start, stop)
+                else:
+                    clip_start = start <= data[:, idx]
+                    clip_stop = data[:, idx] < stop
+                    data = data[np.logical_and(clip_start, clip_stop), :]
                 lbound = self.extents[idx]
                 ubound = self.extents[self.ndims:][idx]
                 lower_bounds.append(lbound if slc.start is None else slc.start)
                 upper_bounds.append(ubound if slc.stop is None else slc.stop)
+            elif idx == 0 and isinstance(slc, numbers.Number):
+                data = self._x_rows(slc, slc, side='right')
+                if not len(data):
+                    raise IndexError("Value %s not found in data." % slc)
             else:
                 data_index = data[:, idx] == slc
                 if not any(data_index):
@@ -130,9 +180,10 @@ class Chart(Element2D):
     @classmethod
     def collapse_data(cls, data, function, **kwargs):
         new_data = [arr[:, 1:] for arr in data]
-        if isinstance(function, np.ufunc):
+        collapsed = util.stream_reduce(new_data, function, **kwargs)
+        if collapsed is None and isinstance(function, np.ufunc):
             collapsed = function.reduce(new_data)
-        else:
+        elif collapsed is None:
             collapsed = function(np.dstack(new_data), axis=-1, **kwargs)
         return np.hstack([data[0][:, 0, np.newaxis], collapsed])
 
@@ -203,8 +254,7 @@ class Chart(Element2D):
             else:
                 data = self.data
             if len(data):
-                data = data[:, dim_idx]
-                data_range = np.nanmin(data), np.nanmax(data)
+                data_range = self._cached_range(dim.name, lambda: self._column_ranges(data))
             else:
                 data_range = (np.NaN, np.NaN)
         if data_range:
@@ -213,6 +263,14 @@ class Chart(Element2D):
             return dim.soft_range
 
 
+    def _column_ranges(self, data):
+        """
+        Computes the ranges of all columns of the data in one pass.
+        """
+        names = [d.name for d in self.kdims + self.vdims]
+        return dict(zip(names, zip(np.nanmin(data, axis=0), np.nanmax(data, axis=0))))
+
+
     def dframe(self):
         import pandas as pd
         columns = [d.name for d in self.dimensions()]
@@ -1,10 +1,10 @@
 from itertools import product
 import numpy as np
-import colorsys
 import param
 
 from ..core import util
-from ..core import OrderedDict, Dimension, NdMapping, Element2D, Overlay, Element
+from ..core import OrderedDict, Dimension, NdMapping, NdElement, Element2D, Overlay, Element
+from ..core.element import ColumnData
 from ..core.boundingregion import BoundingRegion, BoundingBox
 from ..core.sheetcoords import SheetCoordinateSystem, Slice
 from .chart import Curve
@@ -35,7 +35,10 @@ class Raster(Element2D):
     vdims = param.List(default=[Dimension('z')], bounds=(1, 1), doc="""
         The dimension description of the data held in the data array.""")
 
+    _cache_attributes = Element2D._cache_attributes + ['_pyramid_cache']
+
     def __init__(self, data, extents=None, **params):
+        data = self._load_array(data)
         if extents is None:
             (d1, d2) = data.shape[:2]
             extents = (0, 0, d2, d1)
@@ -55,13 +58,138 @@ class Raster(Element2D):
                               extents=None)
 
 
+    @classmethod
+    def _load_array(cls, data):
+        """
+        Loads data supplied as the path to a .npy file as a read-only
+        memory map, so that only the regions that are accessed are
+        read from disk.
+        """
+        if isinstance(data, util.basestring):
+            return np.load(data, mmap_mode='r')
+        return data
+
+
+    def _channel_ranges(self):
+        """
+        Computes the ranges of all value channels in one chunked pass,
+        avoiding copies of memory mapped arrays.
+        """
+        mins, maxs = util.array_range(np.atleast_3d(self.data))
+        return dict(zip([d.name for d in self.vdims], zip(mins, maxs)))
+
+
+    def _key_range(self, dim_idx):
+        """
+        The range of integer coordinates along the given key
+        dimension, computed from the array shape.
+        """
+        return (0, self.data.shape[1-dim_idx]-1)
+
+
+    def pyramid(self, shape):
+        """
+        Returns the data downsampled by the largest power of two that
+        keeps it at least as large as the supplied (rows, columns)
+        shape. The levels of the pyramid are computed by averaging 2x2
+        blocks of the previous level and are cached until the data is
+        replaced.
+        """
+        cache = getattr(self, '_pyramid_cache', None)
+        if cache is None or cache[0] is not self.data:
+            cache = self._pyramid_cache = (self.data, [self.data])
+        levels = cache[1]
+        while True:
+            level = levels[-1]
+            rows, cols = level.shape[:2]
+            if rows < 2 * shape[0] or cols < 2 * shape[1]:
+                break
+            levels.append(util.block_mean(level))
+        for level in levels:
+            if level.shape[0] < 2 * shape[0] or level.shape[1] < 2 * shape[1]:
+                return level
+
+
+    @classmethod
+    def _sample_coords(cls, samples):
+        """
+        Converts samples supplied either as a list of (x, y) tuples
+        or as a tuple of x- and y-coordinate arrays into a pair of
+        coordinate arrays.
+        """
+        if isinstance(samples, tuple):
+            xs, ys = samples
+        else:
+            coords = np.array(list(samples), dtype=np.float).reshape(-1, 2)
+            xs, ys = coords[:, 0], coords[:, 1]
+        return (np.asarray(xs, dtype=np.float).ravel(),
+                np.asarray(ys, dtype=np.float).ravel())
+
+
+    def _sampling_key(self):
+        """
+        Returns a key that is equal for Rasters whose coordinates map
+        onto the same matrix indices.
+        """
+        return (type(self), self.data.shape)
+
+
+    @classmethod
+    def sample_frames(cls, frames, samples, stack=None):
+        """
+        Samples the same coordinates across a list of Rasters, which
+        must share the same type, shape and coordinate system. The
+        matrix indices are resolved once and used to index every
+        frame. Returns the x- and y-coordinate arrays along with one
+        array of shape (frames, samples) per value dimension, or None
+        if the frames are not compatible. If the frames are views onto
+        a single stacked array, it may be supplied to index all frames
+        at once.
+        """
+        if not all(isinstance(f.data, np.ndarray) for f in frames):
+            return None
+        key = frames[0]._sampling_key()
+        if not all(f._sampling_key() == key for f in frames):
+            return None
+        xs, ys = cls._sample_coords(samples)
+        indices = frames[0]._coord2matrix((xs, ys))
+        if stack is not None:
+            values = np.asarray(stack[(slice(None),)+tuple(indices)])
+        else:
+            values = np.array([f.data[indices] for f in frames])
+        columns = [values] if values.ndim == 2 else [values[..., i] for i in range(values.shape[2])]
+        return (xs, ys), columns
+
+
     def _coord2matrix(self, coord):
-        return int(round(coord[1])), int(round(coord[0]))
+        if np.isscalar(coord[0]) and np.isscalar(coord[1]):
+            return int(round(coord[1])), int(round(coord[0]))
+        return (np.round(coord[1]).astype(int),
+                np.round(coord[0]).astype(int))
+
+
+    def range(self, dim, data_range=True):
+        dimension = self.get_dimension(dim)
+        if (not data_range or dimension is None or dimension.range != (None, None)
+            or dimension not in self.kdims + self.vdims):
+            return super(Raster, self).range(dim, data_range)
+        if dimension in self.vdims and isinstance(self.data, np.ndarray):
+            drange = self._cached_range(dimension.name, self._channel_ranges)
+        elif dimension in self.kdims:
+            drange = self._key_range(self.get_dimension_index(dimension))
+        else:
+            drange = self._cached_range(dimension.name, lambda: {
+                dimension.name: util.find_range(self.dimension_values(dimension.name))})
+        soft_range = [r for r in dimension.soft_range if r is not None]
+        return util.find_range(drange, soft_range)
 
 
     @classmethod
     def collapse_data(cls, data_list, function, **kwargs):
-        if isinstance(function, np.ufunc):
+        collapsed = util.stream_reduce(data_list, function, **kwargs)
+        if collapsed is not None:
+            return collapsed
+        elif isinstance(function, np.ufunc):
             return function.reduce(data_list)
         else:
             return function(np.dstack(data_list), axis=-1, **kwargs)
@@ -76,23 +204,21 @@ class Raster(Element2D):
         of the sampled unit indexed by the value in the new_xaxis
         tuple.
         """
-        if isinstance(samples, tuple):
-            X, Y = samples
-            samples = zip(X, Y)
         params = dict(self.get_param_values(onlychanged=True),
                       vdims=self.vdims)
         params.pop('extents', None)
         params.pop('bounds', None)
+        params.pop('sparse', None)
         if len(sample_values) == self.ndims or len(samples):
             if not len(samples):
                 samples = zip(*[c if isinstance(c, list) else [c] for didx, c in
                                sorted([(self.get_dimension_index(k), v) for k, v in
                                        sample_values.items()])])
-            table_data = OrderedDict()
-            for c in samples:
-                table_data[c] = self.data[self._coord2matrix(c)]
+            xs, ys = self._sample_coords(samples)
+            values = self._matrix_values(self._coord2matrix((xs, ys)))
+            columns = [values] if values.ndim == 1 else list(values.T)
             params['kdims'] = self.kdims
-            return Table(table_data, **params)
+            return Table(ColumnData([xs, ys] + columns), **params)
         else:
             dimension, sample_coord = list(sample_values.items())[0]
             if isinstance(sample_coord, slice):
@@ -111,7 +237,7 @@ class Raster(Element2D):
 
             # Sample data
             x_vals = sorted(set(self.dimension_values(other_dimension[0].name)))
-            data = list(zip(x_vals, self.data[sample[::-1]]))
+            data = list(zip(x_vals, self._matrix_values(tuple(sample[::-1]))))
             params['kdims'] = other_dimension
             return Curve(data, **params)
 
@@ -138,34 +264,48 @@ class Raster(Element2D):
                 reduced_view = reduced_view.reduce(**{dim: reduce_fn})
             return reduced_view
         else:
-            dimension, reduce_fn = reduce_map.items()[0]
+            dimension, reduce_fn = list(reduce_map.items())[0]
             other_dimension = [d for d in self.kdims if d.name != dimension]
             x_vals = sorted(set(self.dimension_values(other_dimension[0].name)))
-            data = zip(x_vals, reduce_fn(self.data, axis=self.get_dimension_index(other_dimension[0])))
+            axis = self.get_dimension_index(other_dimension[0])
+            data = zip(x_vals, self._reduce_matrix(reduce_fn, axis))
             params = dict(dict(self.get_param_values(onlychanged=True)),
                           kdims=other_dimension, vdims=self.vdims)
             params.pop('bounds', None)
             params.pop('extents', None)
+            params.pop('sparse', None)
             return Table(data, **params)
 
 
     def dimension_values(self, dim):
         """
         The set of samples available along a particular dimension.
+        The samples are returned in the row-major order of the data
+        array, so the values are a view onto the data where possible
+        and memory mapped arrays are not copied into memory.
         """
         dim_idx = self.get_dimension_index(dim)
         if dim_idx in [0, 1]:
-            shape = self.data.shape[abs(dim_idx)]
-            dim_max = self.data.shape[abs(dim_idx-1)]
-            linspace = list(range(0, dim_max))
-            coords = linspace * shape
-            return coords if dim_idx else sorted(coords)
+            rows, cols = self.data.shape[:2]
+            if dim_idx:
+                return np.repeat(np.arange(rows), cols)
+            return np.tile(np.arange(cols), rows)
         elif dim_idx == 2:
-            return self.data.T.flatten()
+            return self.data.reshape(-1)
         else:
             return super(Raster, self).dimension_values(dim)
 
 
+    def _matrix_values(self, index):
+        "Returns the values of the data array at the (row, column) index."
+        return self.data[index]
+
+
+    def _reduce_matrix(self, function, axis):
+        "Applies the reduce function along an axis of the data array."
+        return function(self.data, axis=axis)
+
+
     @property
     def depth(self):
         return 1 if len(self.data.shape) == 2 else self.data.shape[2]
@@ -200,8 +340,18 @@ class HeatMap(Raster):
 
     group = param.String(default='HeatMap', constant=True)
 
+    sparse = param.Boolean(default=False, doc="""
+        Whether to hold only the coordinates and values of the
+        supplied samples rather than a dense array padded with NaNs.
+        Sparse HeatMaps have no .data array; a dense representation
+        of the whole HeatMap, optionally downsampled to a maximum
+        shape, may be obtained using the dense method.""")
+
     def __init__(self, data, extents=None, **params):
         self._data, array, dimensions = self._process_data(data, params)
+        if array is None:
+            dim1_keys, dim2_keys = self._dense_keys
+            params['extents'] = (0, 0, len(dim1_keys), len(dim2_keys))
         super(HeatMap, self).__init__(array, **dict(params, **dimensions))
 
 
@@ -222,18 +372,23 @@ class HeatMap(Raster):
         else:
             raise TypeError('HeatMap only accepts dict or NdMapping types.')
 
-        keys = list(data.keys())
-        dim1_keys = NdMapping([(k[0], None) for k in keys],
-                              kdims=[self.kdims[0]]).keys()
-        dim2_keys = NdMapping([(k[1], None) for k in keys],
-                              kdims=[self.kdims[1]]).keys()
-        grid_keys = [((i1, d1), (i2, d2)) for i1, d1 in enumerate(dim1_keys)
-                     for i2, d2 in enumerate(dim2_keys)]
-
-        array = np.zeros((len(dim2_keys), len(dim1_keys)))
-        for (i1, d1), (i2, d2) in grid_keys:
-            val = data.get((d1, d2), np.NaN)
-            array[len(dim2_keys)-i2-1, i1] = val[0] if isinstance(val, tuple) else val
+        kdims = dimensions['kdims']
+        (dim1_keys, idx1), (dim2_keys, idx2) = [self._dense_index(data.dimension_values(i), kdims[i])
+                                                for i in range(2)]
+        if isinstance(data, NdElement):
+            values = data.dimension_values(data.vdims[0].name)
+        else:
+            values = [v[0] if isinstance(v, tuple) else v for v in data.values()]
+        values = np.asarray(values, dtype=np.float)
+
+        valid = (idx1 >= 0) & (idx2 >= 0)
+        self._dense_keys = (dim1_keys, dim2_keys)
+        if params.get('sparse', self.sparse):
+            self._sparse = (idx1[valid], idx2[valid], values[valid])
+            return data, None, dimensions
+        self._sparse = None
+        array = np.full((len(dim2_keys), len(dim1_keys)), np.NaN)
+        array[len(dim2_keys)-idx2[valid]-1, idx1[valid]] = values[valid]
 
         return data, array, dimensions
 
@@ -251,13 +406,118 @@ class HeatMap(Raster):
         return self.clone(self._data.select(**dict(zip(self._data._cached_index_names, coords))))
 
 
+    @classmethod
+    def _dense_index(cls, keys, dimension):
+        """
+        Returns the unique keys along a dimension, sorted as an
+        NdMapping would sort them, along with the index of each of
+        the supplied keys into the sorted unique keys. Keys that could
+        not be located are assigned an index of -1.
+        """
+        original = keys.tolist() if isinstance(keys, np.ndarray) else list(keys)
+        keys = np.asarray(keys)
+        if keys.dtype.kind in 'biuf':
+            # Keeps the original key objects, e.g. ints mixed with floats
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            uniques = [original[i] for i in first]
+        else:
+            keys = keys.tolist() if keys.dtype.kind != 'O' else list(keys)
+            uniques = list(OrderedDict.fromkeys(keys))
+            lookup = {k: i for i, k in enumerate(uniques)}
+            inverse = np.array([lookup[k] for k in keys], dtype=int)
+        dense_keys = NdMapping([(k, None) for k in uniques],
+                               kdims=[dimension]).keys()
+        positions = {k: i for i, k in enumerate(dense_keys)}
+        ranks = np.array([positions.get(k, -1) for k in uniques], dtype=int)
+        return dense_keys, ranks[inverse]
+
+
+    @property
+    def depth(self):
+        return 1
+
+
+    def dense(self, shape=None):
+        """
+        Returns a dense array of the HeatMap values with NaNs for
+        missing samples. If a maximum (rows, columns) shape is
+        supplied and the HeatMap is larger, neighbouring cells are
+        merged by averaging, allowing sparse HeatMaps to be rendered
+        at display resolution.
+        """
+        dim1_keys, dim2_keys = self.dense_keys()
+        ncols, nrows = len(dim1_keys), len(dim2_keys)
+        out_rows, out_cols = nrows, ncols
+        if shape is not None:
+            out_rows, out_cols = min(nrows, shape[0]), min(ncols, shape[1])
+        if self._sparse is None:
+            if (out_rows, out_cols) == (nrows, ncols):
+                return self.data
+            rows, idx1 = np.nonzero(np.isfinite(self.data))
+            idx2, values = nrows-rows-1, self.data[rows, idx1]
+        else:
+            idx1, idx2, values = self._sparse
+
+        rows = (nrows-idx2-1) * out_rows // max(nrows, 1)
+        cols = idx1 * out_cols // max(ncols, 1)
+        indices = rows * out_cols + cols
+        counts = np.bincount(indices, minlength=out_rows*out_cols)
+        sums = np.bincount(indices, weights=values, minlength=out_rows*out_cols)
+        with np.errstate(invalid='ignore'):
+            return (sums / counts).reshape(out_rows, out_cols)
+
+
+    def _matrix_values(self, index):
+        """
+        Looks up the (row, column) index in the dense array, which for
+        sparse HeatMaps is located among the sparse samples, returning
+        NaN for cells without a sample.
+        """
+        if self._sparse is None:
+            return super(HeatMap, self)._matrix_values(index)
+        dim1_keys, dim2_keys = self.dense_keys()
+        shape = (len(dim2_keys), len(dim1_keys))
+        # Applies the usual array indexing semantics to each axis
+        rows, cols = np.broadcast_arrays(*[np.arange(n)[i] for i, n in zip(index, shape)])
+        idx1, idx2, values = self._sparse
+        cells = (shape[0]-idx2-1) * shape[1] + idx1
+        order = np.argsort(cells)
+        cells, values = cells[order], values[order]
+        query = rows * shape[1] + cols
+        result = np.full(query.shape, np.NaN)
+        if len(cells):
+            positions = np.searchsorted(cells, query).clip(0, len(cells)-1)
+            found = cells[positions] == query
+            result[found] = values[positions[found]]
+        return result
+
+
+    def _reduce_matrix(self, function, axis):
+        """
+        Reduces the dense array along an axis. Sparse HeatMaps reduce
+        only the available samples in each row or column, so missing
+        cells are ignored rather than filled with NaNs.
+        """
+        if self._sparse is None:
+            return super(HeatMap, self)._reduce_matrix(function, axis)
+        dim1_keys, dim2_keys = self.dense_keys()
+        idx1, idx2, values = self._sparse
+        if axis:
+            codes, ngroups = len(dim2_keys)-idx2-1, len(dim2_keys)
+        else:
+            codes, ngroups = idx1, len(dim1_keys)
+        groups, codes = np.unique(codes, return_inverse=True)
+        reduced = np.full(ngroups, np.NaN)
+        reduced[groups] = util.group_reduce(values, codes, len(groups), function)
+        return reduced
+
+
     def dense_keys(self):
-        keys = list(self._data.keys())
-        dim1_keys = NdMapping([(k[0], None) for k in keys],
-                              kdims=[self.kdims[0]]).keys()
-        dim2_keys = NdMapping([(k[1], None) for k in keys],
-                              kdims=[self.kdims[1]]).keys()
-        return dim1_keys, dim2_keys
+        if getattr(self, '_dense_keys', None) is None:
+            self._dense_keys = tuple(self._dense_index(self._data.dimension_values(i),
+                                                       self.kdims[i])[0]
+                                     for i in range(2))
+        return self._dense_keys
 
 
     def dimension_values(self, dim):
@@ -275,6 +535,10 @@ class HeatMap(Raster):
             return super(HeatMap, self).dimension_values(dim)
 
 
+    def _key_range(self, dim_idx):
+        return util.find_range(self.dimension_values(dim_idx))
+
+
     def dframe(self, dense=False):
         if dense:
             keys1, keys2 = self.dense_keys()
@@ -313,6 +577,7 @@ class Image(SheetCoordinateSystem, Raster):
             l, b, r, t = bounds
             bounds = BoundingBox(points=((l, b), (r, t)))
         if data is None: data = np.array([[0]])
+        data = self._load_array(data)
         l, b, r, t = bounds.lbrt()
         extents = extents if extents else (None, None, None, None)
         Element2D.__init__(self, data, extents=extents, bounds=bounds,
@@ -384,37 +649,43 @@ class Image(SheetCoordinateSystem, Raster):
             else:
                 data_range = (l, r)
         elif dim_idx < len(self.vdims) + 2:
-            dim_idx -= 2
-            data = np.atleast_3d(self.data)[:, :, dim_idx]
-            data_range = (np.nanmin(data), np.nanmax(data))
+            data_range = self._cached_range(dim.name, self._channel_ranges)
         if data_range:
             return util.max_range([data_range, dim.soft_range])
         else:
             return dim.soft_range
 
 
+    def _sampling_key(self):
+        return (type(self), self.data.shape, self.bounds.lbrt(),
+                self.xdensity, self.ydensity)
+
+
     def _coord2matrix(self, coord):
         return self.sheet2matrixidx(*coord)
 
 
     def dimension_values(self, dim):
         """
-        The set of samples available along a particular dimension.
+        The set of samples available along a particular dimension,
+        in the row-major order of the data array (i.e. starting from
+        the top row of the Image).
         """
         dim_idx = self.get_dimension_index(dim)
         if dim_idx in [0, 1]:
             l, b, r, t = self.bounds.lbrt()
-            dim1, dim2 = self.data.shape
-            d1_half_unit = (r - l)/dim1/2.
-            d2_half_unit = (t - b)/dim2/2.
-            d1lin = np.linspace(l+d1_half_unit, r-d1_half_unit, dim1)
-            d2lin = np.linspace(b+d2_half_unit, t-d2_half_unit, dim2)
-            X, Y = np.meshgrid(d1lin, d2lin)
-            return X.flatten() if dim_idx else Y.flatten()
+            rows, cols = self.data.shape[:2]
+            if dim_idx:
+                half_unit = (t - b)/rows/2.
+                ys = np.linspace(t-half_unit, b+half_unit, rows)
+                return np.repeat(ys, cols)
+            half_unit = (r - l)/cols/2.
+            xs = np.linspace(l+half_unit, r-half_unit, cols)
+            return np.tile(xs, rows)
         elif dim_idx == 2:
-            return np.flipud(self.data).T.flatten()
+            return self.data.reshape(-1)
         else:
-            super(Image, self).dimension_values(dim)
+            return super(Image, self).dimension_values(dim)
 
 
 
@@ -494,12 +765,13 @@ class RGB(Image):
         """
         dim_idx = self.get_dimension_index(dim)
         if self.ndims <= dim_idx < len(self.dimensions()):
-            return np.flipud(self.data[:,:,dim_idx-self.ndims]).T.flatten()
+            return self.data[:,:,dim_idx-self.ndims].reshape(-1)
         return super(RGB, self).dimension_values(dim)
 
 
     def __init__(self, data, **params):
         sliced = None
+        data = self._load_array(data)
         if isinstance(data, Overlay):
             images = data.values()
             if not all(isinstance(im, Image) for im in images):
@@ -570,19 +842,50 @@ class HSV(RGB):
         If an alpha channel is supplied, the defined alpha_dimension
         is automatically appended to this list.""")
 
-    hsv_to_rgb = np.vectorize(colorsys.hsv_to_rgb)
+    _cache_attributes = RGB._cache_attributes + ['_rgb_cache']
+
+    @staticmethod
+    def hsv_to_rgb(h, s, v):
+        """
+        Vectorized equivalent of colorsys.hsv_to_rgb, converting
+        arrays of hue, saturation and value to a tuple of red, green
+        and blue arrays.
+        """
+        h, s, v = [np.asarray(c, dtype=np.float) for c in (h, s, v)]
+        f = h * 6.0
+        i = np.trunc(f)
+        f -= i
+        i = i.astype(int) % 6
+        p = v * (1.0 - s)
+        q = s * f
+        np.subtract(1.0, q, out=q)
+        q *= v
+        t = 1.0 - f
+        t *= s
+        np.subtract(1.0, t, out=t)
+        t *= v
+        return (np.choose(i, [v, q, p, p, t, v]),
+                np.choose(i, [t, v, v, q, p, p]),
+                np.choose(i, [p, p, t, v, v, q]))
+
 
     @property
     def rgb(self):
         """
-        Conversion from HSV to RGB.
+        Conversion from HSV to RGB. The result is cached until the
+        data or bounds are replaced.
         """
+        cache = getattr(self, '_rgb_cache', None)
+        if cache is not None and cache[0] is self.data and cache[1] is self.bounds:
+            return cache[2]
         hsv = self.hsv_to_rgb(self.data[:,:,0],
                               self.data[:,:,1],
                               self.data[:,:,2])
         if len(self.vdims) == 4:
             hsv += (self.data[:,:,3],)
 
-        return RGB(np.dstack(hsv), bounds=self.bounds,
-                   group=self.group,
-                   label=self.label)
+        rgb = RGB(np.dstack(hsv), bounds=self.bounds,
+                  group=self.group,
+                  label=self.label)
+        self._rgb_cache = (self.data, self.bounds, rgb)
+        return rgb
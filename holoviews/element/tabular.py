@@ -185,7 +185,7 @@ class Table(NdElement):
 
     @property
     def rows(self):
-        return len(self.data) + 1
+        return len(self) + 1
 
     @property
     def cols(self):
@@ -207,7 +207,9 @@ class Table(NdElement):
             return str(self.kdims[col])
         else:
             dim = self.get_dimension(col)
-            if col >= ndims:
+            if self._columns is not None:
+                val = self._columns.columns[col][row-1]
+            elif col >= ndims:
                 row_values = self.values()[row-1]
                 val = row_values[col - ndims]
             else:
@@ -3,13 +3,19 @@ Collection of either extremely generic or simple ElementOperation
 examples.
 """
 
+import hashlib
+import threading
+
 import numpy as np
 
 import param
 
-from ..core import ElementOperation, NdOverlay, Overlay
-from ..core.util import find_minmax
-from ..element.chart import Histogram, Curve
+from ..core import (ElementOperation, Element, NdOverlay, Overlay, HoloMap,
+                    Dimension, OrderedDict)
+from ..core.operation import Deferred, _apply_operations
+from ..core.boundingregion import BoundingBox
+from ..core.util import find_minmax, axis_reduce
+from ..element.chart import Histogram, Curve, Points, Scatter
 from ..element.raster import Image, RGB
 from ..element.path import Contours
 
@@ -91,6 +97,10 @@ class chain(ElementOperation):
     Instances are only required when arguments need to be passed to
     individual operations so the resulting object is a function over a
     single argument.
+
+    Consecutive pointwise operations, such as threshold, are fused and
+    applied in place to a single copy of the Raster data. See Deferred
+    for building such pipelines by composing operations directly.
     """
 
     output_type = param.Parameter(Image, doc="""
@@ -106,14 +116,13 @@ class chain(ElementOperation):
        that are applied on the input from left to right..""")
 
     def _process(self, view, key=None):
-        processed = view
-        for operation in self.p.operations:
-            processed = operation.process_element(processed, key,
-                                                  input_ranges=self.p.input_ranges)
-
+        operations = [(op, dict(input_ranges=self.p.input_ranges))
+                      for op in self.p.operations]
+        processed = _apply_operations(view, key, operations)
         return processed.clone(group=self.p.group)
 
 
+
 class transform(ElementOperation):
     """
     Generic ElementOperation to transform an input Image or RGBA
@@ -276,19 +285,33 @@ class threshold(ElementOperation):
     group = param.String(default='Threshold', doc="""
        The group assigned to the thresholded output.""")
 
+    pointwise = True
+
     def _process(self, matrix, key=None):
 
         if not isinstance(matrix, Image):
             raise TypeError("The threshold operation requires a Image as input.")
 
         arr = matrix.data
-        high = np.ones(arr.shape) * self.p.high
-        low = np.ones(arr.shape) * self.p.low
-        thresholded = np.where(arr > self.p.level, high, low)
+        thresholded = np.where(arr > self.p.level, float(self.p.high),
+                               float(self.p.low))
 
         return matrix.clone(thresholded, group=self.p.group)
 
 
+    def _process_array(self, matrix, data, key=None):
+        if not isinstance(matrix, Image):
+            raise TypeError("The threshold operation requires a Image as input.")
+        mask = data > self.p.level
+        data.fill(self.p.low)
+        np.copyto(data, self.p.high, where=mask)
+        return data
+
+
+    def _clone_array(self, matrix, data):
+        return matrix.clone(data, group=self.p.group)
+
+
 
 class gradient(ElementOperation):
     """
@@ -348,6 +371,42 @@ class convolve(ElementOperation):
         convolution in lbrt (left, bottom, right, top) format. By
         default, no slicing is applied.""")
 
+    # Spectra of recently used kernels, keyed by the kernel content
+    # and the shape of the target. The cache is shared by all
+    # instances, so updates are guarded by a lock for the threaded
+    # executor.
+    _kernel_spectra = OrderedDict()
+
+    _spectra_lock = threading.Lock()
+
+    _max_spectra = 16
+
+    @classmethod
+    def _kernel_spectrum(cls, k, shape):
+        """
+        Returns the real FFT of the kernel k padded to the target
+        shape, with the shift that centres the kernel and the kernel
+        normalization folded into the spectrum.
+        """
+        key = (hashlib.sha1(np.ascontiguousarray(k).view(np.uint8)).hexdigest(),
+               k.shape, k.dtype.str, shape)
+        with cls._spectra_lock:
+            spectrum = cls._kernel_spectra.pop(key, None)
+            if spectrum is not None:
+                cls._kernel_spectra[key] = spectrum
+                return spectrum
+        k_rows, k_cols = k.shape
+        fy = np.fft.fftfreq(shape[0])[:, np.newaxis] * (k_rows//2)
+        fx = np.fft.rfftfreq(shape[1])[np.newaxis, :] * (k_cols//2)
+        spectrum = np.fft.rfft2(k, s=shape)
+        spectrum *= np.exp(2j * np.pi * (fy + fx)) / float(k.sum())
+        with cls._spectra_lock:
+            cls._kernel_spectra[key] = spectrum
+            while len(cls._kernel_spectra) > cls._max_spectra:
+                cls._kernel_spectra.popitem(last=False)
+        return spectrum
+
+
     def _process(self, overlay, key=None):
         if len(overlay) != 2:
             raise Exception("Overlay must contain at least to items.")
@@ -362,15 +421,114 @@ class convolve(ElementOperation):
 
         k = kernel.data if self.p.kernel_roi == (0,0,0,0) else kernel[xslice, yslice].data
 
-        fft1 = np.fft.fft2(target.data)
-        fft2 = np.fft.fft2(k, s= target.data.shape)
-        convolved_raw = np.fft.ifft2(fft1 * fft2).real
+        shape = target.data.shape
+        spectrum = self._kernel_spectrum(k, shape)
+        convolved = np.fft.irfft2(np.fft.rfft2(target.data) * spectrum, s=shape)
+        return Image(convolved, bounds=target.bounds, group=self.p.group)
 
-        k_rows, k_cols = k.shape
-        rolled = np.roll(np.roll(convolved_raw, -(k_cols//2), axis=-1), -(k_rows//2), axis=-2)
-        convolved = rolled / float(k.sum())
 
-        return Image(convolved, bounds=target.bounds, group=self.p.group)
+
+def _contour_lines(data, levels, xs, ys):
+    """
+    Extracts the lines along which the 2D data array crosses each of
+    the supplied levels using marching squares, where xs and ys are
+    the coordinates of the columns and rows. Crossings are located
+    by linear interpolation along the cell edges and saddle cells are
+    disambiguated using the mean of the cell corners. Returns a list
+    of lines, each an Nx2 array of vertices, for each level.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    rows, cols = data.shape
+    finite = np.isfinite(data)
+    hfinite = finite[:, :-1] & finite[:, 1:]
+    vfinite = finite[:-1, :] & finite[1:, :]
+    nh = rows * (cols-1)
+    ci, cj = np.mgrid[0:rows-1, 0:cols-1]
+    edge_ids = np.dstack([ci*(cols-1)+cj,              # top
+                          nh + ci*cols+cj+1,           # right
+                          (ci+1)*(cols-1)+cj,          # bottom
+                          nh + ci*cols+cj]).reshape(-1, 4) # left
+    center = (data[:-1, :-1] + data[:-1, 1:] + data[1:, :-1] + data[1:, 1:]) / 4.
+
+    all_lines = []
+    for level in levels:
+        above = data > level
+        hcross = (above[:, :-1] != above[:, 1:]) & hfinite
+        vcross = (above[:-1, :] != above[1:, :]) & vfinite
+
+        # Interpolate the crossing point on every crossed edge
+        node_x = np.empty(nh + (rows-1)*cols)
+        node_y = np.empty_like(node_x)
+        hi, hj = np.nonzero(hcross)
+        t = (level - data[hi, hj]) / (data[hi, hj+1] - data[hi, hj])
+        node_x[hi*(cols-1)+hj] = xs[hj] + t * (xs[hj+1] - xs[hj])
+        node_y[hi*(cols-1)+hj] = ys[hi]
+        vi, vj = np.nonzero(vcross)
+        t = (level - data[vi, vj]) / (data[vi+1, vj] - data[vi, vj])
+        node_x[nh+vi*cols+vj] = xs[vj]
+        node_y[nh+vi*cols+vj] = ys[vi] + t * (ys[vi+1] - ys[vi])
+
+        # Join the crossed edges of each cell into segments
+        crossed = np.dstack([hcross[:-1], vcross[:, 1:], hcross[1:],
+                             vcross[:, :-1]]).reshape(-1, 4)
+        ncrossed = crossed.sum(axis=1)
+        single = ncrossed == 2
+        pairs = crossed[single]
+        first, last = pairs.argmax(axis=1), 3 - pairs[:, ::-1].argmax(axis=1)
+        ids = edge_ids[single]
+        rows_idx = np.arange(len(ids))
+        segments = [np.column_stack([ids[rows_idx, first], ids[rows_idx, last]])]
+        saddle = ncrossed == 4
+        if saddle.any():
+            # Cut off the top-right and bottom-left corners if the
+            # top-left corner lies on the same side as the center,
+            # otherwise cut off the top-left and bottom-right corners
+            ids = edge_ids[saddle]
+            corner_above = above[:-1, :-1].ravel()[saddle]
+            center_above = center.ravel()[saddle] > level
+            cut = (corner_above == center_above)[:, np.newaxis]
+            segments.append(np.where(cut, ids[:, [0, 1]], ids[:, [0, 3]]))
+            segments.append(np.where(cut, ids[:, [2, 3]], ids[:, [2, 1]]))
+        segments = np.vstack(segments)
+        if not len(segments):
+            all_lines.append([])
+            continue
+
+        # Stitch the segments into lines, starting from open ends
+        nodes, inverse = np.unique(segments, return_inverse=True)
+        inverse = inverse.reshape(-1, 2)
+        ends = np.concatenate([inverse[:, 0], inverse[:, 1]])
+        others = np.concatenate([inverse[:, 1], inverse[:, 0]])
+        order = np.argsort(ends, kind='mergesort')
+        degree = np.bincount(ends, minlength=len(nodes))
+        first = np.concatenate([[0], np.cumsum(degree)[:-1]])
+        slot = np.arange(len(ends)) - np.repeat(first, degree)
+        neighbors = np.full((len(nodes), 2), -1)
+        neighbors[ends[order], slot] = others[order]
+        nbr0, nbr1 = neighbors[:, 0].tolist(), neighbors[:, 1].tolist()
+
+        visited = [False] * len(nodes)
+        paths, lengths = [], []
+        for start in np.nonzero(degree == 1)[0].tolist() + list(range(len(nodes))):
+            if visited[start]:
+                continue
+            visited[start] = True
+            path, prev, node = [start], -1, start
+            while True:
+                nxt = nbr0[node] if nbr0[node] != prev else nbr1[node]
+                if nxt == -1 or visited[nxt]:
+                    if nxt == start and len(path) > 2:
+                        path.append(start)
+                    break
+                visited[nxt] = True
+                path.append(nxt)
+                prev, node = node, nxt
+            paths += path
+            lengths.append(len(path))
+        vertices = nodes[paths]
+        packed = np.column_stack([node_x[vertices], node_y[vertices]])
+        all_lines.append(np.split(packed, np.cumsum(lengths)[:-1]))
+    return all_lines
 
 
 
@@ -393,21 +551,16 @@ class contours(ElementOperation):
 
 
     def _process(self, matrix, key=None):
-        from matplotlib import pyplot as plt
-
-        figure_handle = plt.figure()
-        extent = matrix.range(0) + matrix.range(1)[::-1]
-        contour_set = plt.contour(matrix.data, extent=extent,
-                                  levels=self.p.levels)
+        (l, r), (b, t) = matrix.range(0), matrix.range(1)
+        rows, cols = matrix.data.shape
+        xs, ys = np.linspace(l, r, cols), np.linspace(t, b, rows)
+        level_lines = _contour_lines(matrix.data, self.p.levels, xs, ys)
 
         contours = NdOverlay(None, kdims=['Levels'])
-        for level, cset in zip(self.p.levels, contour_set.collections):
-            paths = cset.get_paths()
-            lines = [path.vertices for path in paths]
+        for level, lines in zip(self.p.levels, level_lines):
             contours[level] = Contours(lines, group=self.p.group,
                                        label=matrix.label)
 
-        plt.close(figure_handle)
         return matrix * contours
 
 
@@ -446,34 +599,277 @@ class histogram(ElementOperation):
     style_prefix = param.String(default=None, allow_None=None, doc="""
       Used for setting a common style for histograms in a HoloMap or AdjointLayout.""")
 
-    def _process(self, view, key=None):
+    _chunk_size = 2**14
+
+    # Shared bins may be computed over all frames of a HoloMap
+    elementwise = False
+
+    def _selected_dim(self, view):
         if self.p.dimension:
-            selected_dim = self.p.dimension
-        else:
-            selected_dim = [d.name for d in view.vdims + view.kdims][0]
-        data = np.array(view.dimension_values(selected_dim))
-        weights = np.array(view.dimension_values(self.p.weight_dimension)) if self.p.weight_dimension else None
-        hist_range = find_minmax((np.nanmin(data), np.nanmax(data)), (0, -float('inf')))\
-            if self.p.bin_range is None else self.p.bin_range
+            return self.p.dimension
+        return [d.name for d in view.vdims + view.kdims][0]
 
+
+    def _finite_values(self, view):
+        """
+        Returns the finite values along the selected dimension and the
+        corresponding weights, if a weight dimension is specified.
+        """
+        data = np.asarray(view.dimension_values(self._selected_dim(view)), dtype=np.float64)
+        mask = np.isfinite(data)
+        weights = None
+        if self.p.weight_dimension:
+            weights = np.asarray(view.dimension_values(self.p.weight_dimension))[mask]
+        return data[mask], weights
+
+
+    def _edges(self, hist_range):
         # Avoids range issues including zero bin range and empty bins
         if hist_range == (0, 0):
             hist_range = (0, 1)
-        try:
-            data = data[np.invert(np.isnan(data))]
-            hist, edges = np.histogram(data[np.isfinite(data)], normed=self.p.normed,
-                                       range=hist_range, weights=weights, bins=self.p.num_bins)
-        except:
-            edges = np.linspace(hist_range[0], hist_range[1], self.p.num_bins + 1)
-            hist = np.zeros(self.p.num_bins)
-        hist[np.isnan(hist)] = 0
-
-        hist_view = Histogram(hist, edges, kdims=[view.get_dimension(selected_dim)],
-                              label=view.label)
+        elif hist_range[0] == hist_range[1]:
+            hist_range = (hist_range[0]-0.5, hist_range[1]+0.5)
+        return np.linspace(hist_range[0], hist_range[1], self.p.num_bins + 1)
 
+
+    @classmethod
+    def _bin_counts(cls, data, edges, weights=None, codes=None, ngroups=1):
+        """
+        Counts the data falling into each of the uniform bins defined
+        by the edges for each of the groups given by the integer
+        codes, returning an array of shape (ngroups, bins). As in
+        np.histogram, the bins are half-open apart from the last,
+        which includes the upper edge.
+        """
+        nbins = len(edges) - 1
+        keep = (data >= edges[0]) & (data <= edges[-1])
+        data = data[keep]
+        bins = ((data - edges[0]) * (nbins / (edges[-1] - edges[0]))).astype(np.intp)
+        bins[bins == nbins] = nbins - 1
+        # Correct for rounding errors at the bin edges
+        bins[data < edges[bins]] -= 1
+        bins[(data >= edges[bins+1]) & (bins != nbins-1)] += 1
+        if codes is not None:
+            bins += codes[keep] * nbins
+        counts = np.bincount(bins, weights=None if weights is None else weights[keep],
+                             minlength=ngroups*nbins)
+        return counts.reshape(ngroups, nbins).astype(np.float64)
+
+
+    def _stacked_counts(self, frames, edges):
+        """
+        Computes the counts for a list of (data, weights) frames,
+        stacking consecutive frames into chunks of roughly
+        _chunk_size values, which are each binned at once while
+        keeping the temporaries small enough to stay in cache.
+        """
+        counts = np.zeros((len(frames), len(edges)-1))
+        start = 0
+        while start < len(frames):
+            stop, size = start, 0
+            while stop < len(frames) and (stop == start or size+len(frames[stop][0]) <= self._chunk_size):
+                size += len(frames[stop][0])
+                stop += 1
+            chunk = frames[start:stop]
+            data = np.concatenate([d for d, _ in chunk])
+            weights = np.concatenate([w for _, w in chunk]) if self.p.weight_dimension else None
+            codes = np.repeat(np.arange(stop-start), [len(d) for d, _ in chunk])
+            counts[start:stop] = self._bin_counts(data, edges, weights, codes, stop-start)
+            start = stop
+        return counts
+
+
+    def _histogram(self, view, counts, edges):
+        if self.p.normed:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                counts = counts / (counts.sum() * np.diff(edges))
+            counts[np.isnan(counts)] = 0
+        hist_view = Histogram(counts, edges, kdims=[view.get_dimension(self._selected_dim(view))],
+                              label=view.label)
         return (view << hist_view) if self.p.adjoin else hist_view
 
 
+    def __call__(self, element, **params):
+        if isinstance(element, Deferred):
+            return element.apply(self, params)
+        self.p = param.ParamOverrides(self, params)
+        shared = self.p.bin_range is not None or not self.p.individually
+        if (not shared or not isinstance(element, HoloMap) or self.p.cache or
+            self.p.executor != 'serial' or not len(element) or
+            not all(isinstance(el, Element) for el in element)):
+            return super(histogram, self).__call__(element, **params)
+
+        # Bin all frames with the bins shared across the HoloMap
+        frames = [self._finite_values(el) for el in element]
+        if self.p.bin_range is not None:
+            hist_range = tuple(self.p.bin_range)
+        else:
+            ranges = [(d.min(), d.max()) for d, _ in frames if len(d)]
+            if ranges:
+                hist_range = (min(r[0] for r in ranges), max(r[1] for r in ranges))
+                hist_range = find_minmax(hist_range, (0, -float('inf')))
+            else:
+                hist_range = (0, 0)
+        edges = self._edges(hist_range)
+        counts = self._stacked_counts(frames, edges)
+        mapped_items = [(k, self._histogram(el, c, edges))
+                        for (k, el), c in zip(element.items(), counts)]
+        refval = mapped_items[0][1]
+        return element.clone(mapped_items, group=refval.group, label=refval.label)
+
+
+    def _process(self, view, key=None):
+        data, weights = self._finite_values(view)
+        if self.p.bin_range is not None:
+            hist_range = tuple(self.p.bin_range)
+        elif len(data):
+            hist_range = find_minmax((data.min(), data.max()), (0, -float('inf')))
+        else:
+            hist_range = (0, 0)
+        edges = self._edges(hist_range)
+        return self._histogram(view, self._bin_counts(data, edges, weights)[0], edges)
+
+
+
+class cumulative_histogram(histogram):
+    """
+    Accumulates the histograms of all the elements an instance is
+    applied to, returning the Histogram of all the data seen so far.
+    Counts are accumulated over fixed bins defined by the bin_range
+    and num_bins, without revisiting earlier data.
+
+    When applied to a HoloMap, only frames with keys that have not
+    been seen before are added, which allows an instance to be used
+    as a streaming analysis in a Collector run, where it is applied
+    to the growing HoloMap at each time.
+    """
+
+    adjoin = param.Boolean(default=False, doc="""
+      Whether to adjoin the histogram to the ViewableElement.""")
+
+    bin_range = param.NumericTuple(default=(0, 1), doc="""
+      Specifies the fixed range within which to compute the bins.""")
+
+    def reset(self):
+        """
+        Discards the accumulated counts.
+        """
+        self._accumulated = None
+
+
+    def __call__(self, element, **params):
+        if isinstance(element, Deferred):
+            return element.apply(self, params)
+        self.p = param.ParamOverrides(self, params)
+        if isinstance(element, HoloMap):
+            frames = list(element.items())
+        else:
+            frames = [(None, element)]
+        edges = self._edges(tuple(self.p.bin_range))
+        accumulated = getattr(self, '_accumulated', None)
+        if accumulated is None or not np.array_equal(accumulated[0], edges):
+            accumulated = self._accumulated = (edges, np.zeros(len(edges)-1), set())
+        _, counts, seen = accumulated
+        for key, el in frames:
+            if key is not None and key in seen:
+                continue
+            data, weights = self._finite_values(el)
+            counts += self._bin_counts(data, edges, weights)[0]
+            if key is not None:
+                seen.add(key)
+        return self._histogram(frames[-1][1], counts.copy(), edges)
+
+
+
+class aggregate(ElementOperation):
+    """
+    Aggregates the samples of a Points or Scatter Element onto a
+    regular grid, returning an Image of the number of samples in each
+    cell or of the sum or mean of a value dimension. When applied to
+    a HoloMap the Images all share the bounds of the whole HoloMap,
+    unless bounds are explicitly supplied.
+    """
+
+    output_type = Image
+
+    bounds = param.ClassSelector(class_=BoundingBox, default=None, doc="""
+      The bounds of the aggregated Image. By default the bounds are
+      computed from the range of the x- and y-dimensions.""")
+
+    function = param.ObjectSelector(default='count', objects=['count', 'sum', 'mean'], doc="""
+      The aggregation applied to the samples falling into each cell.""")
+
+    height = param.Integer(default=200, bounds=(1, None), doc="""
+      The number of rows of the aggregated Image.""")
+
+    width = param.Integer(default=200, bounds=(1, None), doc="""
+      The number of columns of the aggregated Image.""")
+
+    value_dimension = param.String(default=None, doc="""
+      The dimension aggregated by the sum and mean functions, which
+      defaults to the first dimension after the x- and y-dimension.""")
+
+    group = param.String(default='Aggregate', doc="""
+      The group assigned to the aggregated Image.""")
+
+    # The bounds may be computed over all frames of a HoloMap
+    elementwise = False
+
+    @classmethod
+    def _compute_bounds(cls, element):
+        sample = element.last if isinstance(element, HoloMap) else element
+        xdim, ydim = sample.dimensions(label=True)[:2]
+        lbrt = []
+        for (low, high) in [element.range(xdim), element.range(ydim)]:
+            if low == high:
+                low, high = low - 0.5, high + 0.5
+            lbrt.append((low, high))
+        (l, r), (b, t) = lbrt
+        return BoundingBox(points=((l, b), (r, t)))
+
+
+    def __call__(self, element, **params):
+        if isinstance(element, HoloMap) and params.get('bounds', self.bounds) is None:
+            params['bounds'] = self._compute_bounds(element)
+        return super(aggregate, self).__call__(element, **params)
+
+
+    def _process(self, view, key=None):
+        if not isinstance(view, (Points, Scatter)):
+            raise TypeError("The aggregate operation requires Points or Scatter as input.")
+
+        dims = view.dimensions()
+        bounds = self.p.bounds if self.p.bounds else self._compute_bounds(view)
+        l, b, r, t = bounds.lbrt()
+        width, height = self.p.width, self.p.height
+        xs, ys = view.dimension_values(0), view.dimension_values(1)
+        mask = (xs >= l) & (xs <= r) & (ys >= b) & (ys <= t)
+
+        xidx = np.minimum(((xs[mask] - l) / (r - l) * width).astype(int), width - 1)
+        yidx = np.minimum(((ys[mask] - b) / (t - b) * height).astype(int), height - 1)
+        indices = (height - yidx - 1) * width + xidx
+        counts = np.bincount(indices, minlength=width * height)
+
+        if self.p.function == 'count':
+            vdim = Dimension('Count')
+            data = counts.astype(np.float)
+        else:
+            vdim = (view.get_dimension(self.p.value_dimension)
+                    if self.p.value_dimension else (dims[2] if len(dims) > 2 else None))
+            if vdim is None:
+                raise ValueError("The %s aggregate requires a value dimension."
+                                 % self.p.function)
+            values = np.asarray(view.dimension_values(vdim.name))[mask]
+            data = np.bincount(indices, weights=values, minlength=width * height)
+            if self.p.function == 'mean':
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    data = data / counts
+
+        return Image(data.reshape(height, width), bounds=bounds,
+                     kdims=dims[:2], vdims=[vdim], group=self.p.group,
+                     label=view.label)
+
+
 
 #==================#
 # Other operations #
@@ -498,18 +894,125 @@ class collapse_curve(ElementOperation):
     group = param.String(default='Collapses', doc="""
        The group assigned to the collapsed curve output.""")
 
-    def _process(self, overlay, key=None):
+    skip_nan = param.Boolean(default=False, doc="""
+        Whether NaN y-values are ignored when collapsing each x-value,
+        e.g. computing np.nanmean in place of np.mean.""")
 
-        for curve in overlay:
+    def _curves(self, overlay):
+        curves = list(overlay)
+        for curve in curves:
             if not isinstance(curve, Curve):
-                raise ValueError("The collapse_curve operation requires Curves as input.")
-            if not all(curve.data[:,0] == overlay.get(0).data[:,0]):
-                raise ValueError("All input curves must have same x-axis values.")
+                raise ValueError("The %s operation requires Curves as input." % type(self).__name__)
+        return curves
 
-        data = []
-        for i, xval in enumerate(overlay.get(0).data[:,0]):
-            yval = self.p.fn([c.data[i,1]  for c in overlay])
-            data.append((xval, yval))
 
-        return Curve(np.array(data), group=self.p.group,
+    def _collapse(self, overlay, xs, ys, skip_nan):
+        yvals = axis_reduce(ys, self.p.fn, axis=0, skip_nan=skip_nan)
+        return Curve(np.column_stack([xs, yvals]), group=self.p.group,
                      label=self.get_overlay_label(overlay))
+
+
+    def _process(self, overlay, key=None):
+        curves = self._curves(overlay)
+        xs = curves[0].data[:, 0]
+        if not all(np.array_equal(curve.data[:, 0], xs) for curve in curves):
+            raise ValueError("All input curves must have same x-axis values.")
+        ys = np.vstack([curve.data[:, 1] for curve in curves])
+        return self._collapse(overlay, xs, ys, self.p.skip_nan)
+
+
+
+class reduce_overlay(collapse_curve):
+    """
+    Given an overlay of Curves, which may be sampled at different
+    x-values, compute a new curve which is reduced for each x-value
+    given a specified function.
+
+    The curves are merged on the sorted union of their x-values. An
+    outer join keeps every x-value, reducing over the curves sampled
+    there (NaN y-values are then always ignored), while an inner join
+    keeps only the x-values shared by all the curves. Merging requires
+    the x-values within each curve to be unique.
+    """
+
+    join = param.ObjectSelector(default='outer', objects=['outer', 'inner'], doc="""
+        Whether to keep the x-values found in any of the curves
+        ('outer') or only those found in all of them ('inner').""")
+
+    def _process(self, overlay, key=None):
+        curves = self._curves(overlay)
+        xs = curves[0].data[:, 0]
+        if all(np.array_equal(curve.data[:, 0], xs) for curve in curves):
+            ys = np.vstack([curve.data[:, 1] for curve in curves])
+            return self._collapse(overlay, xs, ys, self.p.skip_nan)
+        if any(len(np.unique(curve.data[:, 0])) != len(curve) for curve in curves):
+            raise ValueError("Curves sampled at different x-values may "
+                             "only be reduced if their x-values are unique.")
+        xs = np.unique(np.concatenate([curve.data[:, 0] for curve in curves]))
+        ys = np.full((len(curves), len(xs)), np.NaN)
+        sampled = np.zeros(len(xs), dtype=int)
+        for i, curve in enumerate(curves):
+            indices = np.searchsorted(xs, curve.data[:, 0])
+            ys[i, indices] = curve.data[:, 1]
+            sampled[indices] += 1
+        if self.p.join == 'inner':
+            shared = sampled == len(curves)
+            xs, ys = xs[shared], ys[:, shared]
+        skip_nan = self.p.skip_nan or self.p.join == 'outer'
+        return self._collapse(overlay, xs, ys, skip_nan)
+
+
+
+class decimate(ElementOperation):
+    """
+    Downsample a Curve by dividing the x-axis into a number of
+    equally sized buckets and keeping only the first, last, minimum
+    and maximum sample in each bucket. Since the extrema of every
+    bucket are preserved, the decimated curve is indistinguishable
+    from the original when each bucket is no wider than a pixel.
+    """
+
+    output_type = Curve
+
+    num_buckets = param.Integer(default=1000, bounds=(1, None), doc="""
+       The number of buckets the x-axis is divided into, usually
+       chosen to match the width of the plot in pixels.""")
+
+    x_range = param.NumericTuple(default=None, length=2, doc="""
+       The x-range to decimate, e.g. the visible range of a plot.
+       Samples outside the range are dropped, except for a single
+       sample either side so that the curve extends to the edges. By
+       default the full x-range of the Curve is used.""")
+
+    def _process(self, curve, key=None):
+        if not isinstance(curve, Curve):
+            raise TypeError("The decimate operation requires a Curve as input.")
+
+        data = curve.data
+        if self.p.x_range is None:
+            x0, x1 = curve.range(0)
+        else:
+            x0, x1 = self.p.x_range
+            xs = data[:, 0]
+            inside = (xs >= x0) & (xs <= x1)
+            visible = inside.copy()
+            visible[:-1] |= inside[1:]
+            visible[1:] |= inside[:-1]
+            data = data[visible]
+
+        num_buckets = self.p.num_buckets
+        if len(data) <= 4 * num_buckets:
+            return curve.clone(data)
+
+        xs, ys = data[:, 0], data[:, 1]
+        span = float(x1 - x0) if x1 > x0 else 1.
+        buckets = np.clip(((xs - x0) / span * num_buckets).astype(int),
+                          0, num_buckets - 1)
+        order = np.lexsort((ys, buckets))
+        sorted_buckets = buckets[order]
+        starts = np.flatnonzero(np.concatenate([[True], sorted_buckets[1:] != sorted_buckets[:-1]]))
+        ends = np.concatenate([starts[1:], [len(order)]]) - 1
+        keep = np.unique(np.concatenate([np.minimum.reduceat(order, starts),
+                                         order[starts], order[ends],
+                                         np.maximum.reduceat(order, starts)]))
+        return curve.clone(data[keep])
@@ -90,6 +90,12 @@ class Normalization(ElementOperation):
         return self._process(element, key)
 
 
+    def process_array(self, element, data, key, ranges={}, keys=None, **params):
+        params = dict(params,ranges=ranges, keys=keys)
+        self.p = param.ParamOverrides(self, params)
+        return self._process_array(element, data, key)
+
+
     def get_ranges(self, element, key):
         """
         Method to get the appropriate normalization range dictionary
@@ -138,6 +144,8 @@ class raster_normalization(Normalization):
     dictionary.
     """
 
+    pointwise = True
+
     def _process(self, raster, key=None):
         if isinstance(raster, Raster):
             return self._normalize_raster(raster, key)
@@ -152,23 +160,32 @@ class raster_normalization(Normalization):
 
     def _normalize_raster(self, raster, key):
         if not isinstance(raster, Raster): return raster
-        norm_raster = raster.clone(raster.data.copy())
+        return raster.clone(self._process_array(raster, raster.data.copy(), key))
+
+
+    def _process_array(self, raster, data, key=None):
+        """
+        Normalizes the supplied array holding the data of the raster
+        in place.
+        """
+        if not isinstance(raster, Raster):
+            raise ValueError("Input element must be a Raster or subclass of Raster.")
         ranges = self.get_ranges(raster, key)
 
         for depth, name in enumerate(d.name for d in raster.vdims):
             depth_range = ranges.get(name, (None, None))
             if None in depth_range:  continue
-            if depth_range and len(norm_raster.data.shape) == 2:
+            if depth_range and len(data.shape) == 2:
                 depth_range = ranges[name]
-                norm_raster.data[:,:] -= depth_range[0]
+                data[:,:] -= depth_range[0]
                 range = (depth_range[1] - depth_range[0])
                 if range:
-                    norm_raster.data[:,:] /= range
+                    data[:,:] /= range
             elif depth_range:
-                norm_raster.data[:,:,depth] -= depth_range[0]
+                data[:,:,depth] -= depth_range[0]
                 range = (depth_range[1] - depth_range[0])
                 if range:
-                    norm_raster.data[:,:,depth] /= range
-        return norm_raster
+                    data[:,:,depth] /= range
+        return data
 
 
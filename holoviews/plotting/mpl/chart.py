@@ -1,5 +1,6 @@
 from __future__ import unicode_literals
 from itertools import product
+import weakref
 
 import numpy as np
 from matplotlib import cm
@@ -10,6 +11,7 @@ import param
 from ...core import OrderedDict, NdMapping, CompositeOverlay, HoloMap
 from ...core.util import match_spec
 from ...element import Points, Raster, Polygons
+from ...operation.element import decimate
 from .element import ElementPlot, LegendPlot
 
 
@@ -88,6 +90,12 @@ class CurvePlot(ChartPlot):
         If enabled and plotted quantity is cyclic will center the
         plot around the peak.""")
 
+    decimate = param.Boolean(default=False, doc="""
+        Whether to decimate the curve to at most four samples per
+        pixel along the x-axis, preserving the minimum and maximum of
+        each pixel column. The decimation is recomputed on every frame
+        using the visible x-range and the width of the axis.""")
+
     num_ticks = param.Integer(default=5, doc="""
         If autotick is disabled, this number of tickmarks will be drawn.""")
 
@@ -116,7 +124,7 @@ class CurvePlot(ChartPlot):
 
         # Create xticks and reorder data if cyclic
         xticks = None
-        data = element.data
+        data = self._decimate(element, ranges)
         if self.cyclic_range is not None:
             if self.center_cyclic:
                 self.peak_argmax = np.argmax(element.data[:, 1])
@@ -134,8 +142,26 @@ class CurvePlot(ChartPlot):
         return self._finalize_axis(self.keys[-1], ranges=ranges, xticks=xticks)
 
 
+    def _decimate(self, element, ranges):
+        """
+        Decimates the curve data to the resolution of the axis if
+        decimation is enabled.
+        """
+        if not self.decimate or self.cyclic_range is not None:
+            return element.data
+        axis = self.handles['axis']
+        fig = axis.get_figure()
+        width = axis.get_position().width * fig.get_figwidth() * fig.dpi
+        if not ranges or element.get_dimension(0).name not in ranges:
+            ranges = {}
+        l, _, r, _ = self.get_extents(element, ranges)
+        x_range = (l, r) if np.isfinite([l, r]).all() else None
+        return decimate(element, num_buckets=max(int(width), 1),
+                        x_range=x_range).data
+
+
     def update_handles(self, axis, view, key, ranges=None):
-        data = view.data
+        data = self._decimate(view, ranges)
         if self.cyclic_range is not None:
             data = self._cyclic_curves(view)
         self.handles['line_segment'].set_xdata(data[:, 0])
@@ -634,6 +660,9 @@ class VectorFieldPlot(ElementPlot):
                   'linewidth', 'marker', 'visible', 'cmap',
                   'scale', 'headlength', 'headaxislength', 'pivot']
 
+    # Minimum sampling distances keyed by VectorField
+    _min_dist_cache = weakref.WeakKeyDictionary()
+
     def __init__(self, *args, **params):
         super(VectorFieldPlot, self).__init__(*args, **params)
         self._min_dist = self._get_map_info(self.map)
@@ -673,12 +702,40 @@ class VectorFieldPlot(ElementPlot):
 
     def _get_min_dist(self, vfield):
         "Get the minimum sampling distance."
-        xys = np.array([complex(x,y) for x,y in zip(vfield.data[:,0],
-                                                    vfield.data[:,1])])
-        m, n = np.meshgrid(xys, xys)
-        distances = abs(m-n)
-        np.fill_diagonal(distances, np.inf)
-        return  distances.min()
+        cached = self._min_dist_cache.get(vfield)
+        if cached is not None and cached[0] is vfield.data:
+            return cached[1]
+        min_dist = self._compute_min_dist(vfield.data[:, 0], vfield.data[:, 1])
+        self._min_dist_cache[vfield] = (vfield.data, min_dist)
+        return min_dist
+
+
+    @classmethod
+    def _compute_min_dist(cls, xs, ys):
+        """
+        Computes the minimum distance between any two samples. On a
+        regular grid this is the smallest spacing along either axis,
+        otherwise the samples are swept in sorted order comparing
+        increasingly distant neighbours until no closer pair remains.
+        """
+        if len(xs) < 2:
+            return np.inf
+        xvals, yvals = np.unique(xs), np.unique(ys)
+        if len(xvals) * len(yvals) == len(xs) == len(np.unique(xs + 1j*ys)):
+            return min(np.diff(vals).min() for vals in (xvals, yvals)
+                       if len(vals) > 1)
+        if len(yvals) > len(xvals):
+            xs, ys = ys, xs
+        order = np.argsort(xs, kind='mergesort')
+        xs, ys = xs[order], ys[order]
+        min_dist = np.inf
+        for offset in range(1, len(xs)):
+            dxs = xs[offset:] - xs[:-offset]
+            if dxs.min() >= min_dist:
+                break
+            dists = np.hypot(dxs, ys[offset:] - ys[:-offset])
+            min_dist = min(min_dist, dists.min())
+        return min_dist
 
 
     def initialize_plot(self, ranges=None):
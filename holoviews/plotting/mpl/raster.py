@@ -30,6 +30,13 @@ class RasterPlot(ElementPlot):
     show_values = param.Boolean(default=False, doc="""
         Whether to annotate each pixel with its value.""")
 
+    pyramid = param.Boolean(default=False, doc="""
+        Whether to render large rasters from a cached pyramid of
+        downsampled levels, picking the coarsest level that still
+        provides at least one sample per pixel of the axis. Ensures
+        the rendering time depends on the figure size rather than the
+        size of the data.""")
+
     style_opts = ['alpha', 'cmap', 'interpolation', 'visible',
                   'filterrad', 'clims', 'norm']
 
@@ -61,7 +68,7 @@ class RasterPlot(ElementPlot):
         xticks, yticks = self._compute_ticks(view, ranges)
 
         opts = self.style[self.cyclic_index]
-        data = view.data
+        data = self._raster_data(view)
         clims = opts.pop('clims', None)
         if view.depth != 1:
             opts.pop('cmap', None)
@@ -73,10 +80,7 @@ class RasterPlot(ElementPlot):
         if self.invert_yaxis and type(view) is Raster:
             b, t = t, b
 
-        if isinstance(view, RGB):
-            data = view.rgb.data
-        elif isinstance(view, HeatMap):
-            data = view.data
+        if isinstance(view, HeatMap):
             data = np.ma.array(data, mask=np.logical_not(np.isfinite(data)))
             cmap_name = opts.pop('cmap', None)
             cmap = copy.copy(plt.cm.get_cmap('gray' if cmap_name is None else cmap_name))
@@ -104,6 +108,31 @@ class RasterPlot(ElementPlot):
                                    xticks=xticks, yticks=yticks)
 
 
+    def _axis_shape(self):
+        """
+        Returns the size of the axis in pixels as a (rows, columns)
+        tuple.
+        """
+        axis = self.handles['axis']
+        fig = axis.get_figure()
+        bbox = axis.get_position()
+        shape = (bbox.height * fig.get_figheight() * fig.dpi,
+                 bbox.width * fig.get_figwidth() * fig.dpi)
+        return tuple(max(int(d), 1) for d in shape)
+
+
+    def _raster_data(self, view):
+        """
+        Returns the array to be displayed for the supplied view,
+        downsampling sparse HeatMaps and, if enabled, large rasters
+        to the resolution of the axis.
+        """
+        if isinstance(view, HeatMap):
+            return view.dense(self._axis_shape()) if view.sparse else view.data
+        view = view.rgb if isinstance(view, RGB) else view
+        return view.pyramid(self._axis_shape()) if self.pyramid else view.data
+
+
     def _compute_ticks(self, view, ranges):
         if isinstance(view, HeatMap):
             xdim, ydim = view.kdims
@@ -113,6 +142,9 @@ class RasterPlot(ElementPlot):
             xstep, ystep = ((x1-x0)/num_x, (y1-y0)/num_y)
             xpos = np.linspace(x0+xstep/2., x1-xstep/2., num_x)
             ypos = np.linspace(y0+ystep/2., y1-ystep/2., num_y)
+            if view.sparse:
+                xpos, dim1_keys = xpos[::max(num_x//10, 1)], dim1_keys[::max(num_x//10, 1)]
+                ypos, dim2_keys = ypos[::max(num_y//10, 1)], dim2_keys[::max(num_y//10, 1)]
             xlabels = [xdim.pprint_value(k) for k in dim1_keys]
             ylabels = [ydim.pprint_value(k) for k in dim2_keys]
             return (xpos, xlabels), (ypos, ylabels)
@@ -128,14 +160,20 @@ class RasterPlot(ElementPlot):
         xstep, ystep = 1.0/num_x, 1.0/num_y
         xpos = np.linspace(xstep/2., 1.0-xstep/2., num_x)
         ypos = np.linspace(ystep/2., 1.0-ystep/2., num_y)
-        coords = product(dim1_keys, dim2_keys)
-        plot_coords = product(xpos, ypos)
-        for plot_coord, coord in zip(plot_coords, coords):
-            if isinstance(view, HeatMap):
-                val = view._data.get(coord, np.NaN)
-                val = val[0] if isinstance(val, tuple) else val
+        if isinstance(view, HeatMap) and view.sparse:
+            rows, cols = self._axis_shape()
+            if num_x > cols or num_y > rows:
+                # Downsampled cells are smaller than a pixel and cannot be labelled
+                idx1, idx2, values = [], [], []
             else:
-                val = view[coord]
+                idx1, idx2, values = view._sparse
+            plot_coords = [(xpos[i], ypos[j]) for i, j in zip(idx1, idx2)]
+            vals = list(values)
+        else:
+            coords = product(dim1_keys, dim2_keys)
+            plot_coords = list(product(xpos, ypos))
+            vals = (self._lookup_value(view, coord) for coord in coords)
+        for plot_coord, val in zip(plot_coords, vals):
             val = val_dim.type(val) if val_dim.type else val
             val = val[0] if isinstance(val, tuple) else val
             text = val_dim.pprint_value(val)
@@ -148,15 +186,22 @@ class RasterPlot(ElementPlot):
                 self.handles['annotations'][plot_coord] = annotation
             else:
                 self.handles['annotations'][plot_coord].set_text(text)
-        old_coords = set(self.handles['annotations'].keys()) - set(product(xpos, ypos))
+        old_coords = set(self.handles['annotations'].keys()) - set(plot_coords)
         for plot_coord in old_coords:
             annotation = self.handles['annotations'].pop(plot_coord)
             annotation.remove()
 
 
+    def _lookup_value(self, view, coord):
+        if isinstance(view, HeatMap):
+            val = view._data.get(coord, np.NaN)
+            return val[0] if isinstance(val, tuple) else val
+        return view[coord]
+
+
     def update_handles(self, axis, view, key, ranges=None):
         im = self.handles.get('im', None)
-        im.set_data(view.data)
+        im.set_data(self._raster_data(view))
 
         if isinstance(view, HeatMap) and self.show_values:
            self._annotate_values(view)
@@ -2,6 +2,7 @@
 Tests for the Chart Element types.
 """
 
+import pickle
 import numpy as np
 from holoviews import OrderedDict, Dimension, Chart, Curve, ItemTable
 from holoviews.element.comparison import ComparisonTestCase
@@ -32,6 +33,41 @@ class ChartTest(ComparisonTestCase):
         closest = self.chart.closest([0.51, 1, 9.9])
         self.assertEqual(closest, [1., 1., 10.])
 
+    def test_chart_slice_unsorted(self):
+        curve = Curve(zip([3, 0, 2, 1], [0.3, 0., 0.2, 0.1]))
+        self.assertEqual(curve[1:3], Curve(zip([2, 1], [0.2, 0.1])))
+
+    def test_chart_index_unsorted(self):
+        curve = Curve(zip([3, 0, 2, 1], [0.3, 0., 0.2, 0.1]))
+        self.assertEqual(curve[2], 0.2)
+
+    def test_chart_closest_unsorted(self):
+        curve = Curve(zip([3, 0, 2, 1], [0.3, 0., 0.2, 0.1]))
+        self.assertEqual(curve.closest([-1, 1.4, 2.6, 5]), [0., 1., 3., 3.])
+
+    def test_chart_unpickled_without_sorting_cache(self):
+        del self.curve._x_sorting
+        curve = pickle.loads(pickle.dumps(self.curve))
+        self.assertEqual(curve.closest([0.51, 9.9]), [1., 10.])
+        self.assertEqual(curve[5:9], Curve(zip(range(5, 9), np.linspace(0.5,0.8, 4))))
+
+    def test_chart_sorting_cache_not_pickled(self):
+        curve = Curve(zip([3, 0, 2, 1], [0.3, 0., 0.2, 0.1]))
+        curve.closest([1.4])
+        unpickled = pickle.loads(pickle.dumps(curve))
+        self.assertFalse(hasattr(unpickled, '_x_sorting'))
+        self.assertEqual(unpickled.closest([-1, 1.4]), [0., 1.])
+
+    def test_chart_range(self):
+        self.assertEqual(self.chart.range('x'), (0, 10))
+        self.assertEqual(self.chart.range('y'), (0, 1))
+
+    def test_chart_range_cache_not_pickled(self):
+        self.chart.range('y')
+        chart = pickle.loads(pickle.dumps(self.chart))
+        self.assertFalse(hasattr(chart, '_range_cache'))
+        self.assertEqual(chart.range('y'), (0, 1))
+
     def test_chart_reduce(self):
         mean = self.chart.reduce(x=np.mean)
         itable = ItemTable(OrderedDict([('y', np.mean(self.ys))]))
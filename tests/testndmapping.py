@@ -1,7 +1,8 @@
+import pickle
 from collections import OrderedDict
 
 from holoviews.core import Dimension
-from holoviews.core.ndmapping import MultiDimensionalMapping
+from holoviews.core.ndmapping import MultiDimensionalMapping, NdMapping
 from holoviews.element.comparison import ComparisonTestCase
 
 
@@ -108,3 +109,82 @@ class NdIndexableMappingTest(ComparisonTestCase):
         ndmap = MultiDimensionalMapping(data, kdims=[self.dim1])
 
         self.assertEqual(list(ndmap.keys()), [0, 1])
+
+    def test_idxmapping_setitem_sorted(self):
+        ndmap = MultiDimensionalMapping(kdims=[self.dim1])
+        for k in [5, 1, 3, 7, 0]:
+            ndmap[k] = str(k)
+        self.assertEqual(list(ndmap.keys()), [0, 1, 3, 5, 7])
+        self.assertEqual(list(ndmap.values()), ['0', '1', '3', '5', '7'])
+
+    def test_idxmapping_setitem_categorical_sorted(self):
+        dim = Dimension('cat', values=['b', 'c', 'a'])
+        ndmap = MultiDimensionalMapping(kdims=[dim])
+        for k in ['a', 'b', 'c']:
+            ndmap[k] = k
+        self.assertEqual(list(ndmap.keys()), ['b', 'c', 'a'])
+
+    def test_idxmapping_pop_setitem_sorted(self):
+        ndmap = MultiDimensionalMapping(self.init_item_list, kdims=[self.dim1, self.dim2])
+        ndmap.pop((1, 2.0))
+        ndmap[(3, 1.0)] = 'c'
+        ndmap[(1, 2.0)] = 'a'
+        self.assertEqual(list(ndmap.keys()), [(1, 2.0), (3, 1.0), (5, 3.0)])
+
+    def test_idxmapping_setitem_non_monotonic(self):
+        ndmap = MultiDimensionalMapping(kdims=[self.dim1])
+        keys = [(i * 7919) % 1000 for i in range(1000)]
+        for k in keys:
+            ndmap[k] = k
+            ndmap[k] = -k
+        self.assertEqual(list(ndmap.keys()), sorted(keys))
+        self.assertEqual(list(ndmap.values()), [-k for k in sorted(keys)])
+        self.assertEqual(ndmap.last, -999)
+
+
+    def test_update_after_unsorted_setitem(self):
+        ndmap = MultiDimensionalMapping(kdims=[self.dim1])
+        ndmap[5] = 'b'
+        ndmap[1] = 'a'
+        ndmap.update({3: 'c', 7: 'd'})
+        self.assertEqual(list(ndmap.keys()), [1, 3, 5, 7])
+        self.assertEqual(list(ndmap.values()), ['a', 'c', 'b', 'd'])
+
+
+class NdMappingSliceTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.dim1 = Dimension('intdim', type=int)
+        self.dim2 = Dimension('catdim', values=['c', 'b', 'a'])
+        keys = [(i, c) for i in range(10) for c in 'abc']
+        self.ndmap = NdMapping([(k, i) for i, k in enumerate(keys)],
+                               kdims=[self.dim1, self.dim2])
+
+    def test_ndmapping_slice_range(self):
+        sliced = self.ndmap[2:4, :]
+        self.assertEqual(list(sliced.keys()), [(2, 'c'), (2, 'b'), (2, 'a'),
+                                               (3, 'c'), (3, 'b'), (3, 'a')])
+
+    def test_ndmapping_slice_categorical(self):
+        sliced = self.ndmap[8:, 'c':'a']
+        self.assertEqual(list(sliced.keys()), [(9, 'c'), (9, 'b')])
+
+    def test_ndmapping_slice_set(self):
+        sliced = self.ndmap[1:3, {'a', 'b'}]
+        self.assertEqual(list(sliced.keys()), [(1, 'b'), (1, 'a'), (2, 'b'), (2, 'a')])
+
+    def test_ndmapping_slice_value(self):
+        sliced = self.ndmap[:, 'b']
+        self.assertEqual(list(sliced.keys()), [(i, 'b') for i in range(10)])
+
+    def test_ndmapping_slice_after_setitem(self):
+        self.ndmap[:3, :]
+        self.ndmap[(10, 'a')] = 30
+        sliced = self.ndmap[8:, 'a']
+        self.assertEqual(list(sliced.keys()), [(9, 'a'), (10, 'a')])
+
+    def test_ndmapping_slice_unpickled_without_index_cache(self):
+        del self.ndmap._key_index_cache
+        ndmap = pickle.loads(pickle.dumps(self.ndmap))
+        sliced = ndmap[2:4, {'a'}]
+        self.assertEqual(list(sliced.keys()), [(2, 'a'), (3, 'a')])
@@ -0,0 +1,376 @@
+"""
+Unit tests of the ElementOperations in holoviews.operation.
+"""
+
+import numpy as np
+from holoviews import Curve, Points, Image, HoloMap, NdOverlay
+from holoviews.operation.element import (decimate, aggregate, threshold, gradient, chain,
+                                         convolve, contours, histogram, cumulative_histogram,
+                                         collapse_curve, reduce_overlay)
+from holoviews.core.operation import Deferred
+from holoviews.element.comparison import ComparisonTestCase
+
+
+class DecimateTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.xs = np.linspace(0, 10, 1001)
+        self.ys = np.sin(self.xs)
+        self.ys[500] = 5
+        self.curve = Curve((self.xs, self.ys))
+
+    def test_decimate_short_curve(self):
+        self.assertEqual(decimate(self.curve, num_buckets=1000), self.curve)
+
+    def test_decimate_preserves_extrema(self):
+        decimated = decimate(self.curve, num_buckets=10)
+        self.assertEqual(len(decimated) <= 40, True)
+        self.assertEqual(decimated.range('y'), self.curve.range('y'))
+
+    def test_decimate_preserves_order(self):
+        decimated = decimate(self.curve, num_buckets=10)
+        self.assertEqual(np.all(np.diff(decimated.data[:, 0]) > 0), True)
+
+    def test_decimate_x_range(self):
+        decimated = decimate(self.curve, num_buckets=10, x_range=(2, 4))
+        self.assertEqual(decimated.data[0, 0], 1.99)
+        self.assertEqual(decimated.data[-1, 0], 4.01)
+
+
+class AggregateTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.points = Points(np.array([[0, 0, 1], [1, 1, 2], [1, 1, 4],
+                                       [0.5, 0.5, 3]]), vdims=['z'])
+
+    def test_aggregate_count(self):
+        image = aggregate(self.points, width=2, height=2)
+        self.assertEqual(image.data, np.array([[0, 3], [1, 0]]))
+        self.assertEqual(image.bounds.lbrt(), (0, 0, 1, 1))
+
+    def test_aggregate_sum(self):
+        image = aggregate(self.points, width=2, height=2, function='sum')
+        self.assertEqual(image.data, np.array([[0, 9], [1, 0]]))
+        self.assertEqual(image.vdims[0].name, 'z')
+
+    def test_aggregate_mean(self):
+        image = aggregate(self.points, width=2, height=2, function='mean')
+        self.assertEqual(image.data[0, 1], 3)
+        self.assertEqual(np.isnan(image.data[0, 0]), True)
+
+    def test_aggregate_holomap_shared_bounds(self):
+        hmap = HoloMap({i: Points(np.array([[0, 0], [i, i]])) for i in range(1, 3)})
+        aggregated = aggregate(hmap, width=2, height=2)
+        self.assertEqual([im.bounds.lbrt() for im in aggregated],
+                         [(0, 0, 2, 2), (0, 0, 2, 2)])
+
+
+class ExecutorTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.hmap = HoloMap({i: Image(np.random.rand(5, 5)*i) for i in range(6)},
+                            kdims=['Frame'])
+        self.expected = threshold(self.hmap, level=2.)
+
+    def assert_thresholded(self, processed):
+        self.assertEqual(processed.keys(), self.expected.keys())
+        for el, expected in zip(processed.values(), self.expected.values()):
+            self.assertEqual(el.data, expected.data)
+
+    def test_thread_executor(self):
+        self.assert_thresholded(threshold(self.hmap, level=2., executor='thread',
+                                          workers=2, chunksize=2))
+
+    def test_process_executor(self):
+        self.assert_thresholded(threshold(self.hmap, level=2., executor='process',
+                                          workers=2, chunksize=4))
+
+
+class OperationCacheTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.cache = threshold.result_cache
+        self.cache.clear()
+        self.max_bytes = self.cache.max_bytes
+        self.image = Image(np.random.rand(10, 10))
+
+    def tearDown(self):
+        self.cache.max_bytes = self.max_bytes
+        self.cache.clear()
+
+    def test_cache_disabled_by_default(self):
+        threshold(self.image, level=0.5)
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_cache_hit(self):
+        first = threshold(self.image, level=0.5, cache=True)
+        second = threshold(self.image, level=0.5, cache=True)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(self.cache.stats(), dict(hits=1, misses=1, entries=1,
+                                                  nbytes=first.data.nbytes))
+
+    def test_cache_miss_on_parameter_change(self):
+        threshold(self.image, level=0.5, cache=True)
+        threshold(self.image, level=0.6, cache=True)
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+    def test_cache_miss_on_data_change(self):
+        threshold(self.image, level=0.5, cache=True)
+        threshold(self.image.clone(self.image.data*2), level=0.5, cache=True)
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+    def test_cache_hit_on_identical_copy_and_clone(self):
+        threshold(self.image, level=0.5, cache=True)
+        threshold(Image(self.image.data.copy()), level=0.5, cache=True)
+        threshold(self.image.clone(), level=0.5, cache=True)
+        self.assertEqual(self.cache.stats()['hits'], 2)
+
+    def test_cache_holomap_frames(self):
+        hmap = HoloMap({i: Image(np.random.rand(5, 5)) for i in range(3)})
+        threshold(hmap, level=0.5, cache=True)
+        threshold(hmap, level=0.5, cache=True)
+        self.assertEqual(self.cache.stats()['hits'], 3)
+
+    def test_cache_evicts_least_recently_used(self):
+        self.cache.max_bytes = self.image.data.nbytes * 2
+        for level in [0.1, 0.2, 0.3]:
+            threshold(self.image, level=level, cache=True)
+        self.assertEqual(self.cache.stats()['entries'], 2)
+        threshold(self.image, level=0.1, cache=True)
+        self.assertEqual(self.cache.stats()['hits'], 0)
+
+
+class ChainTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.image = Image(np.random.rand(10, 10))
+        self.operations = [threshold.instance(level=0.3, high=3.),
+                           threshold.instance(level=2.),
+                           gradient.instance()]
+
+    def test_threshold_dtype(self):
+        self.assertEqual(threshold(self.image, high=2, low=1).data.dtype, np.float64)
+
+    def test_chain_fused_threshold(self):
+        chained = chain(self.image, operations=self.operations[:2])
+        expected = threshold(threshold(self.image, level=0.3, high=3.), level=2.)
+        self.assertEqual(chained.data, expected.data)
+        self.assertEqual(chained.group, 'Chain')
+
+    def test_chain_fused_does_not_modify_input(self):
+        data = self.image.data.copy()
+        chain(self.image, operations=self.operations[:2])
+        self.assertEqual(self.image.data, data)
+
+    def test_chain_fused_then_gradient(self):
+        chained = chain(self.image, operations=self.operations)
+        expected = gradient(threshold(threshold(self.image, level=0.3, high=3.), level=2.))
+        self.assertEqual(chained.data, expected.data)
+
+
+class DeferredTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.image = Image(np.random.rand(10, 10))
+        self.map = HoloMap({i: Image(np.random.rand(10, 10) * i) for i in range(1, 4)},
+                           kdims=['Frame'])
+
+    def test_deferred_builds_graph(self):
+        graph = threshold(gradient(Deferred(self.image)), level=0.2)
+        source, operations = graph.graph()
+        self.assertTrue(source is self.image)
+        self.assertEqual([type(op) for op, _ in operations], [gradient, threshold])
+        self.assertEqual(operations[1][1], dict(level=0.2))
+
+    def test_deferred_matches_eager(self):
+        graph = threshold(threshold(Deferred(self.image), level=0.3, high=3.), level=2.)
+        expected = threshold(threshold(self.image, level=0.3, high=3.), level=2.)
+        self.assertEqual(graph.evaluate().data, expected.data)
+        self.assertEqual(graph.evaluate().group, expected.group)
+
+    def test_deferred_does_not_modify_input(self):
+        data = self.image.data.copy()
+        threshold(Deferred(self.image), level=0.5).evaluate()
+        self.assertEqual(self.image.data, data)
+
+    def test_deferred_holomap_per_frame(self):
+        graph = threshold(gradient(Deferred(self.map)), level=0.1)
+        expected = threshold(gradient(self.map), level=0.1)
+        evaluated = graph.evaluate()
+        self.assertEqual(evaluated.keys(), expected.keys())
+        for key in expected.keys():
+            self.assertEqual(evaluated[key].data, expected[key].data)
+        self.assertEqual(graph.evaluate(2).data, expected[2].data)
+
+    def test_deferred_empty_holomap(self):
+        hmap = HoloMap(kdims=['Frame'])
+        evaluated = threshold(Deferred(hmap), level=0.5).evaluate()
+        self.assertEqual(len(evaluated), 0)
+        self.assertEqual(len(threshold(hmap, level=0.5)), 0)
+
+    def test_deferred_non_elementwise_operation(self):
+        points = HoloMap({i: Points(np.random.rand(20, 2) * i) for i in range(1, 3)},
+                         kdims=['Frame'])
+        graph = threshold(aggregate(Deferred(points), width=5, height=5), level=1)
+        expected = threshold(aggregate(points, width=5, height=5), level=1)
+        self.assertEqual(graph.evaluate()[2].data, expected[2].data)
+
+
+class ConvolveTest(ComparisonTestCase):
+
+    def reference(self, target, kernel):
+        raw = np.fft.ifft2(np.fft.fft2(target) * np.fft.fft2(kernel, s=target.shape)).real
+        k_rows, k_cols = kernel.shape
+        rolled = np.roll(np.roll(raw, -(k_cols//2), axis=-1), -(k_rows//2), axis=-2)
+        return rolled / kernel.sum()
+
+    def test_convolve_odd_shape(self):
+        target, kernel = np.random.rand(9, 7), np.random.rand(3, 4)
+        convolved = convolve(Image(target) * Image(kernel))
+        self.assertEqual(convolved.data, self.reference(target, kernel))
+
+    def test_convolve_holomap_reuses_kernel_spectrum(self):
+        kernel = np.random.rand(3, 3)
+        targets = [np.random.rand(8, 8) for i in range(3)]
+        hmap = HoloMap({i: Image(t) * Image(kernel) for i, t in enumerate(targets)})
+        convolved = convolve(hmap)
+        for i, target in enumerate(targets):
+            self.assertEqual(convolved[i].data, self.reference(target, kernel))
+
+    def test_convolve_thread_executor_shared_spectra(self):
+        kernels = [np.random.rand(3, 3) for i in range(4)]
+        targets = [np.random.rand(8, 8) for i in range(40)]
+        hmap = HoloMap({i: Image(t) * Image(kernels[i % 4])
+                        for i, t in enumerate(targets)})
+        convolved = convolve(hmap, executor='thread', workers=4, chunksize=1)
+        for i, target in enumerate(targets):
+            self.assertEqual(convolved[i].data, self.reference(target, kernels[i % 4]))
+        self.assertEqual(len(convolve._kernel_spectra) <= convolve._max_spectra, True)
+
+
+class ContoursTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.image = Image(np.array([[0, 0, 0, 0],
+                                     [0, 1, 1, 0],
+                                     [0, 1, 1, 0],
+                                     [0, 0, 0, 0.]]), bounds=(0, 0, 3, 3))
+
+    def test_contours_closed_line(self):
+        lines = contours(self.image, levels=(0.5,)).get(1)[0.5].data
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0][0], lines[0][-1])
+        self.assertEqual(len(lines[0]), 9)
+        self.assertEqual(np.unique(np.abs(lines[0] - 1.5)), np.array([0.5, 1.]))
+
+    def test_contours_multiple_levels(self):
+        overlay = contours(self.image, levels=(0.25, 0.75, 2.))
+        self.assertEqual(overlay.get(1).keys(), [0.25, 0.75, 2.])
+        self.assertEqual(overlay.get(1)[2.].data, [])
+
+    def test_contours_open_lines_end_on_boundary(self):
+        image = Image(np.tile(np.arange(4.), (3, 1)), bounds=(0, 0, 3, 2))
+        lines = contours(image, levels=(1.5,)).get(1)[1.5].data
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0][:, 0], np.array([1.5, 1.5, 1.5]))
+
+
+
+class HistogramTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.map = HoloMap({i: Image(np.arange(16.).reshape(4, 4) * (i+1)) for i in range(3)},
+                           kdims=['t'])
+
+    def test_histogram_matches_numpy(self):
+        hist = histogram(self.map[1], bin_range=None, num_bins=5, normed=False, adjoin=False)
+        counts, edges = np.histogram(self.map[1].data, bins=5, range=(0, 30))
+        self.assertEqual(hist.values, counts.astype(float))
+        self.assertEqual(hist.edges, edges)
+
+    def test_histogram_holomap_shared_bins(self):
+        hists = histogram(self.map, bin_range=(0, 40), num_bins=4, normed=False, adjoin=False)
+        for k, image in self.map.items():
+            counts, edges = np.histogram(image.data, bins=4, range=(0, 40))
+            self.assertEqual(hists[k].values, counts.astype(float))
+            self.assertEqual(hists[k].edges, edges)
+
+    def test_histogram_holomap_global_range(self):
+        hists = histogram(self.map, bin_range=None, individually=False, normed=False,
+                          num_bins=3, adjoin=False)
+        self.assertEqual(hists[0].edges, np.linspace(0, 45, 4))
+        self.assertEqual(hists[2].values, np.array([5., 5., 6.]))
+
+    def test_histogram_holomap_global_range_includes_zero(self):
+        offset = self.map.clone({k: Image(v.data + 10) for k, v in self.map.items()})
+        hists = histogram(offset, bin_range=None, individually=False, normed=False,
+                          num_bins=3, adjoin=False)
+        self.assertEqual(hists[0].edges, np.linspace(0, 55, 4))
+        single = histogram(offset.clone({0: offset[2]}), bin_range=None, individually=False,
+                           normed=False, num_bins=3, adjoin=False)
+        self.assertEqual(single[0].edges, histogram(offset[2], bin_range=None, num_bins=3,
+                                                    adjoin=False).edges)
+
+    def test_histogram_normed_ignores_nans(self):
+        data = np.arange(16.).reshape(4, 4)
+        data[0, 0] = np.NaN
+        hist = histogram(Image(data), bin_range=(0, 16), num_bins=4, adjoin=False)
+        counts, _ = np.histogram(data[np.isfinite(data)], bins=4, range=(0, 16), density=True)
+        self.assertEqual(hist.values, counts)
+
+    def test_cumulative_histogram_accumulates_new_frames(self):
+        accumulator = cumulative_histogram.instance(bin_range=(0, 48), num_bins=4, normed=False)
+        accumulated = HoloMap(kdims=['t'])
+        for k, image in self.map.items():
+            accumulated[k] = image
+            hist = accumulator(accumulated)
+        counts, _ = np.histogram([im.data for im in self.map], bins=4, range=(0, 48))
+        self.assertEqual(hist.values, counts.astype(float))
+        accumulator.reset()
+        self.assertEqual(accumulator(self.map[0]).values.sum(), 16.)
+
+
+
+class CollapseCurveTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.ys = np.array([[0, 1, 2, np.NaN], [2, 3, 4, 5.]])
+        self.overlay = NdOverlay({i: Curve(np.column_stack([np.arange(4.), ys]))
+                                  for i, ys in enumerate(self.ys)})
+
+    def test_collapse_curve_mean(self):
+        collapsed = collapse_curve(self.overlay).data
+        self.assertEqual(collapsed[:3, 1], np.array([1., 2., 3.]))
+        self.assertTrue(np.isnan(collapsed[3, 1]))
+
+    def test_collapse_curve_skip_nan(self):
+        collapsed = collapse_curve(self.overlay, fn=np.max, skip_nan=True).data
+        self.assertEqual(collapsed, np.array([[0, 2], [1, 3], [2, 4], [3, 5.]]))
+
+    def test_collapse_curve_custom_function(self):
+        collapsed = collapse_curve(self.overlay, fn=lambda ys: ys[-1] - ys[0]).data
+        self.assertEqual(collapsed[:3, 1], np.array([2., 2., 2.]))
+
+    def test_collapse_curve_mismatched_x(self):
+        overlay = NdOverlay({0: Curve(np.array([[0, 1.], [1, 2.]])),
+                             1: Curve(np.array([[0, 1.], [2, 2.]]))})
+        with self.assertRaises(ValueError):
+            collapse_curve(overlay)
+
+    def test_reduce_overlay_outer_join(self):
+        overlay = NdOverlay({0: Curve(np.array([[0, 1.], [1, 2.], [2, 3.]])),
+                             1: Curve(np.array([[2, 5.], [1, 4.], [3, 7.]]))})
+        reduced = reduce_overlay(overlay, fn=np.sum).data
+        self.assertEqual(reduced, np.array([[0, 1.], [1, 6.], [2, 8.], [3, 7.]]))
+
+    def test_reduce_overlay_inner_join(self):
+        overlay = NdOverlay({0: Curve(np.array([[0, 1.], [1, 2.], [2, 3.]])),
+                             1: Curve(np.array([[2, 5.], [1, 4.], [3, 7.]]))})
+        reduced = reduce_overlay(overlay, join='inner').data
+        self.assertEqual(reduced, np.array([[1, 3.], [2, 4.]]))
+
+    def test_reduce_overlay_repeated_x(self):
+        overlay = NdOverlay({0: Curve(np.array([[0, 1.], [1, 2.], [1, 3.]])),
+                             1: Curve(np.array([[1, 4.], [2, 5.]]))})
+        with self.assertRaises(ValueError):
+            reduce_overlay(overlay, fn=len)
@@ -4,7 +4,7 @@ Tests of plot instantiation (not display tests, just instantiation)
 
 from unittest import SkipTest
 import numpy as np
-from holoviews import Curve, Scatter, Overlay
+from holoviews import Curve, Scatter, Overlay, VectorField, HeatMap
 from holoviews.element.comparison import ComparisonTestCase
 
 try:
@@ -15,6 +15,12 @@ try:
 except:
     pyplot = None
 
+try:
+    from holoviews.plotting.mpl.chart import VectorFieldPlot
+    from holoviews.plotting.mpl.raster import RasterPlot
+except:
+    VectorFieldPlot = None
+
 
 class TestPlotInstantiation(ComparisonTestCase):
 
@@ -29,3 +35,61 @@ class TestPlotInstantiation(ComparisonTestCase):
         o = Overlay([Curve(np.array([[0, 1]])) , Scatter([[1,1]]) , Curve(np.array([[0, 1]]))])
         OverlayPlot(o)
 
+
+
+
+class TestVectorFieldMinDist(ComparisonTestCase):
+
+    def setUp(self):
+        if VectorFieldPlot is None:
+            raise SkipTest("Matplotlib required to test plot instantiation")
+
+    def test_min_dist_random_points(self):
+        xs, ys = np.random.rand(2, 200)
+        dists = np.hypot(xs[:, None] - xs, ys[:, None] - ys)
+        expected = dists[np.triu_indices(len(xs), 1)].min()
+        self.assertEqual(VectorFieldPlot._compute_min_dist(xs, ys), expected)
+
+    def test_min_dist_regular_grid(self):
+        xs, ys = np.meshgrid(np.arange(0, 5, 0.5), np.arange(0, 2, 0.25))
+        order = np.random.permutation(xs.size)
+        min_dist = VectorFieldPlot._compute_min_dist(xs.flat[order], ys.flat[order])
+        self.assertEqual(min_dist, 0.25)
+
+    def test_min_dist_cache(self):
+        vfield = VectorField(np.column_stack([np.arange(4.), np.zeros(4),
+                                              np.zeros(4), np.ones(4)]))
+        plot = VectorFieldPlot(vfield)
+        self.assertEqual(plot._min_dist, 1.)
+        def fail(xs, ys): raise AssertionError("Minimum distance recomputed")
+        plot._compute_min_dist = fail
+        self.assertEqual(plot._get_min_dist(vfield), 1.)
+        del plot._compute_min_dist
+        vfield.data = vfield.data * 2
+        self.assertEqual(plot._get_min_dist(vfield), 2.)
+
+
+
+class TestSparseHeatMapPlot(ComparisonTestCase):
+
+    def setUp(self):
+        if VectorFieldPlot is None:
+            raise SkipTest("Matplotlib required to test plot instantiation")
+
+    def test_sparse_heatmap_annotations(self):
+        heatmap = HeatMap({(0, 0): 1., (2, 1): 2., (1, 2): 3.}, sparse=True)
+        plot = RasterPlot(heatmap, show_values=True)
+        plot.initialize_plot()
+        texts = {a.get_text(): xy for xy, a in plot.handles['annotations'].items()}
+        self.assertEqual(sorted(texts), ['1', '2', '3'])
+        self.assertEqual(np.array(texts['3']), np.array([0.5, 5/6.]))
+
+    def test_large_sparse_heatmap_skips_annotations(self):
+        keys = set(zip(np.random.randint(0, 5000, 20000),
+                       np.random.randint(0, 5000, 20000)))
+        heatmap = HeatMap({k: float(i) for i, k in enumerate(keys)}, sparse=True)
+        plot = RasterPlot(heatmap, show_values=True)
+        plot.initialize_plot()
+        self.assertEqual(plot.handles['annotations'], {})
+        # The 5000x5000 key space is downsampled to the axis resolution
+        self.assertTrue(max(plot.handles['im'].get_array().shape) < 1000)
@@ -2,8 +2,14 @@
 Unit tests of Raster elements
 """
 
+import colorsys
+import os
+import pickle
+import tempfile
+
 import numpy as np
-from holoviews.element import Raster, Image
+from holoviews import HoloMap
+from holoviews.element import Raster, Image, HSV, HeatMap, Curve
 from holoviews.element.comparison import ComparisonTestCase
 
 class TestRaster(ComparisonTestCase):
@@ -36,3 +42,239 @@ class TestRaster(ComparisonTestCase):
         image = Image(self.array1)
         self.assertEqual(image.sample(y=0.25).data,
                          np.array([(-0.333333, 0), (0, 1), (0.333333, 2)]))
+
+    def test_raster_sample_points(self):
+        raster = Raster(self.array1)
+        table = raster.sample([(0, 0), (2, 1), (1, 0)])
+        self.assertEqual(table.dimension_values('z'), np.array([0, 1, 5]))
+
+    def test_image_sample_coordinate_arrays(self):
+        image = Image(self.array1)
+        table = image.sample((np.array([-0.4, 0.4]), np.array([0.25, -0.25])))
+        self.assertEqual(table.dimension_values('z'), np.array([0, 5]))
+
+    def test_holomap_sample_stacked(self):
+        hmap = HoloMap({i: Image(self.array1*i) for i in range(3)}, kdims=['Frame'])
+        table = hmap.sample([(-0.4, 0.25), (0.4, -0.25)])
+        self.assertEqual(table.kdims, ['Frame', 'x', 'y'])
+        self.assertEqual(table.dimension_values('z'), np.array([0, 0, 0, 5, 0, 10]))
+
+    def test_holomap_sample_mismatched_shapes(self):
+        hmap = HoloMap({0: Image(self.array1), 1: Image(self.array1.T)}, kdims=['Frame'])
+        table = hmap.sample([(0, 0)])
+        self.assertEqual(np.array(table.dimension_values('z')), np.array([4, 4]))
+
+    def test_raster_range(self):
+        raster = Raster(self.array1)
+        self.assertEqual(raster.range('z'), (0, 5))
+
+    def test_image_range_data_replaced(self):
+        image = Image(self.array1)
+        self.assertEqual(image.range('z'), (0, 5))
+        image.data = self.array1 * 2
+        self.assertEqual(image.range('z'), (0, 10))
+
+    def test_hsv_rgb_conversion(self):
+        hsv = np.dstack([np.linspace(0, 1, 12).reshape(3, 4),
+                         np.linspace(0, 1, 12).reshape(3, 4)[::-1],
+                         np.full((3, 4), 0.8)])
+        expected = np.vectorize(colorsys.hsv_to_rgb)(hsv[:, :, 0], hsv[:, :, 1],
+                                                     hsv[:, :, 2])
+        self.assertEqual(HSV(hsv).rgb.data, np.dstack(expected))
+
+    def test_hsv_rgb_cache_not_pickled(self):
+        hsv = HSV(np.random.rand(3, 4, 3))
+        rgb = hsv.rgb.data
+        unpickled = pickle.loads(pickle.dumps(hsv))
+        self.assertFalse(hasattr(unpickled, '_rgb_cache'))
+        self.assertEqual(unpickled.rgb.data, rgb)
+
+    def test_heatmap_dense_array(self):
+        heatmap = HeatMap({(0, 'b'): 1, (1, 'a'): 2, (2, 'b'): 3})
+        self.assertEqual(heatmap.data, np.array([[1, np.NaN, 3],
+                                                 [np.NaN, 2, np.NaN]]))
+
+    def test_heatmap_dense_keys(self):
+        heatmap = HeatMap({(0, 'b'): 1, (1, 'a'): 2, (2, 'b'): 3})
+        self.assertEqual(heatmap.dense_keys(), ([0, 1, 2], ['a', 'b']))
+
+    def test_heatmap_dense_keys_mixed_types(self):
+        heatmap = HeatMap({(0.5, 'b'): 1, (1, 'a'): 2, (2, 'b'): 3})
+        keys = heatmap.dense_keys()[0]
+        self.assertEqual(keys, [0.5, 1, 2])
+        self.assertEqual([type(k) for k in keys], [float, int, int])
+
+    def test_heatmap_sparse_dense(self):
+        data = {(0, 'b'): 1, (1, 'a'): 2, (2, 'b'): 3}
+        sparse = HeatMap(data, sparse=True)
+        self.assertEqual(sparse.data, None)
+        self.assertEqual(sparse.dense(), HeatMap(data).data)
+
+    def test_heatmap_sparse_dense_downsampled(self):
+        sparse = HeatMap({(0, 'b'): 1, (1, 'a'): 2, (2, 'b'): 3}, sparse=True)
+        self.assertEqual(sparse.dense((1, 2)), np.array([[1.5, 3]]))
+
+    def test_heatmap_sparse_slice(self):
+        sparse = HeatMap({(0, 'b'): 1, (1, 'a'): 2, (2, 'b'): 3}, sparse=True)
+        sliced = sparse[1:, :]
+        self.assertEqual(sliced.sparse, True)
+        self.assertEqual(sliced.dimension_values('x'), [2])
+
+    def test_heatmap_sparse_sample(self):
+        data = {(0, 0): 1, (1, 1): 2, (2, 0): 3}
+        sparse, dense = HeatMap(data, sparse=True), HeatMap(data)
+        self.assertEqual(np.array(sparse.sample(x=0).data),
+                         np.array(dense.sample(x=0).data))
+        self.assertEqual(sparse.sample([(1, 0), (2, 1)]).values(),
+                         dense.sample([(1, 0), (2, 1)]).values())
+
+    def test_heatmap_sparse_reduce(self):
+        sparse = HeatMap({(0, 0): 1, (1, 1): 2, (2, 0): 3}, sparse=True)
+        reduced = sparse.reduce(y=np.mean)
+        self.assertEqual(reduced.keys(), [0, 1, 2])
+        self.assertEqual(reduced.values(), [(1.,), (2.,), (3.,)])
+
+    def test_image_from_npy_path(self):
+        fd, path = tempfile.mkstemp(suffix='.npy')
+        os.close(fd)
+        try:
+            np.save(path, self.array1.astype(np.float32))
+            image = Image(path)
+            self.assertEqual(isinstance(image.data, np.memmap), True)
+            self.assertEqual(image.range('z'), (0, 5))
+            sliced = image[-0.5:0, -0.5:0.5]
+            self.assertEqual(isinstance(sliced.data, np.memmap), True)
+            self.assertEqual(np.array(sliced.data), np.array([[0, 1], [3, 4]]))
+            del image, sliced
+        finally:
+            os.remove(path)
+
+    def test_image_pyramid(self):
+        image = Image(np.arange(64.).reshape(8, 8))
+        self.assertEqual(image.pyramid((8, 8)).shape, (8, 8))
+        self.assertEqual(image.pyramid((2, 2)), np.array([[13.5, 17.5], [45.5, 49.5]]))
+
+    def test_image_pyramid_not_pickled(self):
+        image = Image(np.arange(64.).reshape(8, 8))
+        image.pyramid((2, 2))
+        unpickled = pickle.loads(pickle.dumps(image))
+        self.assertFalse(hasattr(unpickled, '_pyramid_cache'))
+        self.assertEqual(unpickled.pyramid((2, 2)), np.array([[13.5, 17.5], [45.5, 49.5]]))
+
+    def test_raster_key_dimension_values(self):
+        raster = Raster(self.array1)
+        self.assertEqual(raster.dimension_values(0), np.array([0, 1, 2, 0, 1, 2]))
+        self.assertEqual(raster.dimension_values(1), np.array([0, 0, 0, 1, 1, 1]))
+        self.assertEqual(raster.dimension_values(2), np.array([0, 1, 2, 3, 4, 5]))
+        self.assertEqual(raster.range(0), (0, 2))
+
+    def test_image_key_dimension_values(self):
+        image = Image(self.array1, bounds=(0, 0, 3, 2))
+        self.assertEqual(image.dimension_values(0), np.array([0.5, 1.5, 2.5, 0.5, 1.5, 2.5]))
+        self.assertEqual(image.dimension_values(1), np.array([1.5, 1.5, 1.5, 0.5, 0.5, 0.5]))
+        self.assertEqual(image.dimension_values(2), np.array([0, 1, 2, 3, 4, 5]))
+
+    def test_image_value_dimension_values_memmap_view(self):
+        fd, path = tempfile.mkstemp(suffix='.npy')
+        os.close(fd)
+        try:
+            np.save(path, self.array1.astype(np.float32))
+            image = Image(path)
+            values = image.dimension_values(2)
+            self.assertEqual(isinstance(values, np.memmap), True)
+            self.assertEqual(np.shares_memory(values, image.data), True)
+            self.assertEqual(np.array(values), np.array([0, 1, 2, 3, 4, 5]))
+            del image, values
+        finally:
+            os.remove(path)
+
+    def test_holomap_collapse_mean(self):
+        hmap = HoloMap({i: Image(self.array1*i) for i in range(4)}, kdims=['Frame'])
+        self.assertEqual(hmap.collapse(['Frame'], np.mean).data, self.array1*1.5)
+
+    def test_holomap_collapse_std(self):
+        arrays = [np.random.rand(2, 3) for i in range(5)]
+        hmap = HoloMap({i: Image(arr) for i, arr in enumerate(arrays)}, kdims=['Frame'])
+        self.assertEqual(hmap.collapse(['Frame'], np.std, ddof=1).data,
+                         np.std(np.dstack(arrays), axis=-1, ddof=1))
+
+    def test_holomap_collapse_unsupported_function(self):
+        hmap = HoloMap({i: Image(self.array1*i) for i in range(3)}, kdims=['Frame'])
+        self.assertEqual(hmap.collapse(['Frame'], np.median).data, self.array1*1.)
+
+    def test_holomap_from_stack(self):
+        stack = np.arange(24.).reshape(4, 2, 3)
+        hmap = HoloMap.from_stack(stack, [0, 1, 2, 3], kdims=['Frame'])
+        self.assertEqual(hmap[2].data, stack[2])
+        self.assertEqual(hmap.range('z'), (0, 23))
+        self.assertEqual(hmap.collapse(['Frame'], np.mean).data, stack.mean(axis=0))
+
+    def test_holomap_from_stack_frames_built_on_access(self):
+        stack = np.arange(24.).reshape(4, 2, 3)
+        hmap = HoloMap.from_stack(stack, [0, 1, 2, 3], kdims=['Frame'])
+        self.assertEqual(hmap.keys(), [0, 1, 2, 3])
+        self.assertEqual(len(hmap), 4)
+        self.assertEqual(hmap.range('z'), (0, 23))
+        self.assertEqual(hmap.sample([(0.4, -0.25)]).dimension_values('z'),
+                         stack[:, 1, 2])
+        self.assertTrue(hmap._stack_frames is not None)
+        self.assertEqual(hmap[3].data, stack[3])
+        self.assertTrue(hmap._stack_frames is None)
+        self.assertEqual(hmap.collapse(['Frame'], np.sum).data, stack.sum(axis=0))
+
+    def test_holomap_from_stack_pickle(self):
+        stack = np.arange(24.).reshape(4, 2, 3)
+        hmap = HoloMap.from_stack(stack, [0, 1, 2, 3], kdims=['Frame'])
+        pending = pickle.loads(pickle.dumps(hmap))
+        self.assertTrue(pending._stack_frames is not None)
+        self.assertEqual(pending[2].data, stack[2])
+        hmap[2]
+        self.assertTrue(hmap._get_stack() is stack)
+        unpickled = pickle.loads(pickle.dumps(hmap))
+        self.assertFalse(hasattr(unpickled, '_stack'))
+        self.assertEqual(unpickled[2].data, stack[2])
+        self.assertEqual(unpickled.range('z'), (0, 23))
+
+    def test_holomap_from_stack_unsorted_keys(self):
+        stack = np.arange(24.).reshape(4, 2, 3)
+        hmap = HoloMap.from_stack(stack, [3, 1, 2, 0], kdims=['Frame'])
+        self.assertEqual(hmap.keys(), [0, 1, 2, 3])
+        self.assertEqual(hmap.sample([(0.4, -0.25)]).dimension_values('z'),
+                         stack[[3, 1, 2, 0], 1, 2])
+        self.assertEqual(hmap[0].data, stack[3])
+        self.assertEqual(hmap.collapse(['Frame'], np.max).data, stack[3])
+
+    def test_holomap_from_stack_sample(self):
+        stack = np.arange(24.).reshape(4, 2, 3)
+        hmap = HoloMap.from_stack(stack, [0, 1, 2, 3], kdims=['Frame'])
+        table = hmap.sample([(0.4, -0.25)])
+        self.assertEqual(table.dimension_values('z'), stack[:, 1, 2])
+
+    def test_holomap_from_stack_replaced_frame(self):
+        stack = np.arange(24.).reshape(4, 2, 3)
+        hmap = HoloMap.from_stack(stack, [0, 1, 2, 3], kdims=['Frame'])
+        hmap[3] = Image(np.zeros((2, 3)))
+        self.assertEqual(hmap.collapse(['Frame'], np.max).data, stack[2])
+
+    def test_holomap_from_stack_collapse_non_ufunc(self):
+        stack = np.random.rand(4, 2, 3)
+        hmap = HoloMap.from_stack(stack, [0, 1, 2, 3], kdims=['Frame'])
+        self.assertEqual(hmap.collapse(['Frame'], np.std).data, stack.std(axis=0))
+        self.assertEqual(hmap.collapse(['Frame'], np.median).data, np.median(stack, axis=0))
+
+    def test_holomap_from_curve_stack_range(self):
+        stack = np.array([np.column_stack([np.arange(5.), np.arange(5.)+10+2*i])
+                          for i in range(3)])
+        hmap = HoloMap.from_stack(stack, [0, 1, 2], kdims=['Frame'], element_type=Curve)
+        self.assertEqual(hmap.range('x'), (0, 4))
+        self.assertEqual(hmap.range('y'), (10, 18))
+
+    def test_holomap_from_curve_stack_collapse(self):
+        stack = np.array([np.column_stack([np.arange(5.), np.arange(5.)+10+2*i])
+                          for i in range(3)])
+        hmap = HoloMap.from_stack(stack, [0, 1, 2], kdims=['Frame'], element_type=Curve)
+        summed = hmap.collapse(['Frame'], np.sum).data
+        self.assertEqual(summed[:, 0], np.arange(5.))
+        self.assertEqual(summed[:, 1], stack[:, :, 1].sum(axis=0))
+        self.assertEqual(hmap.collapse(['Frame'], np.median).data[:, 1],
+                         np.median(stack[:, :, 1], axis=0))
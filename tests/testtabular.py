@@ -3,6 +3,8 @@ Unit tests of tabular elements
 """
 
 from collections import OrderedDict
+
+import numpy as np
 from holoviews import Table, ItemTable
 from holoviews.element.comparison import ComparisonTestCase
 
@@ -66,3 +68,108 @@ class TestTable(ComparisonTestCase):
                       vdims = self.val_dims1)
         self.assertEquals(table['F', 12, 'Height'], 0.8)
 
+
+
+
+class TestColumnarTable(ComparisonTestCase):
+
+    def setUp(self):
+        self.array = np.array([[3, 10, 15, 0.8], [1, 16, 18, 0.6], [2, 12, 10, 0.8]])
+        self.table = Table(self.array, kdims=['Id', 'Age'],
+                           vdims=['Weight', 'Height'])
+
+    def test_columnar_table_init(self):
+        self.assertEquals(self.table.keys(), [(1, 16), (2, 12), (3, 10)])
+        self.assertEquals(self.table.values(), [(18, 0.6), (10, 0.8), (15, 0.8)])
+
+    def test_columnar_table_dimension_values(self):
+        self.assertEqual(self.table.dimension_values('Weight'), np.array([18, 10, 15]))
+
+    def test_columnar_table_index_value(self):
+        self.assertEquals(self.table[2, 12, 'Weight'], 10)
+
+    def test_columnar_table_index_partial_key(self):
+        with self.assertRaises(KeyError):
+            self.table[2]
+
+    def test_columnar_table_slice(self):
+        sliced = self.table[1:3, :]
+        self.assertEquals(type(sliced), Table)
+        self.assertEquals(sliced.keys(), [(1, 16), (2, 12)])
+
+    def test_columnar_table_select_value(self):
+        selected = self.table.select(value='Height')
+        self.assertEquals(selected.vdims, [self.table.vdims[1]])
+        self.assertEquals(selected.values(), [(0.6,), (0.8,), (0.8,)])
+
+    def test_columnar_table_sample(self):
+        sampled = self.table.sample([(3, 10), (1, 16)])
+        self.assertEquals(sampled.keys(), [(1, 16), (3, 10)])
+
+    def test_columnar_table_reindex(self):
+        reindexed = self.table.reindex(['Age'], ['Weight'])
+        self.assertEquals(reindexed.keys(), [10, 12, 16])
+        self.assertEquals(reindexed.values(), [(15,), (10,), (18,)])
+
+    def test_columnar_table_data_conversion(self):
+        self.assertEquals(self.table.data,
+                          OrderedDict([((1, 16), (18, 0.6)), ((2, 12), (10, 0.8)),
+                                       ((3, 10), (15, 0.8))]))
+
+    def test_columnar_table_1d_array(self):
+        table = Table(np.array([1., 2., 3.]))
+        self.assertEquals(table.keys(), [0, 1, 2])
+        self.assertEquals(table.values(), [(1.,), (2.,), (3.,)])
+
+    def test_columnar_table_duplicate_keys_keep_last(self):
+        table = Table(np.array([[1, 2], [1, 3], [0, 5]]), kdims=['x'], vdims=['y'])
+        self.assertEquals(len(table), 2)
+        self.assertEquals(table.keys(), [0, 1])
+        self.assertEquals(table.values(), [(5,), (3,)])
+        self.assertEquals(len(table.reindex(['x'], ['y'])), 2)
+
+    def test_columnar_table_data_access_keeps_columns(self):
+        self.assertEquals(list(self.table.data.keys()), [(1, 16), (2, 12), (3, 10)])
+        self.assertEquals(self.table.dimension_values('Weight'), np.array([18, 10, 15]))
+        self.assertTrue(self.table._columns is not None)
+
+
+
+class TestTableGroupReduce(ComparisonTestCase):
+
+    def setUp(self):
+        data = np.array([[0, 0, 1.], [0, 1, 3.], [1, 0, 2.],
+                         [1, 1, 6.], [1, 2, 7.]])
+        self.table = Table(data, kdims=['x', 'y'], vdims=['z'])
+
+    def test_table_reduce_mean(self):
+        reduced = self.table.reduce(['y'], np.mean)
+        self.assertEquals(reduced.keys(), [0, 1])
+        self.assertEquals(reduced.values(), [(2.,), (5.,)])
+
+    def test_table_reduce_std(self):
+        reduced = self.table.reduce(['y'], np.std)
+        self.assertEquals([v[0] for v in reduced.values()],
+                          [np.std([1., 3.]), np.std([2., 6., 7.])])
+
+    def test_table_reduce_len(self):
+        reduced = self.table.reduce(['y'], len)
+        self.assertEquals(reduced.values(), [(2,), (3,)])
+
+    def test_table_reduce_sum_bool(self):
+        table = Table(OrderedDict([((0, 0), (True,)), ((0, 1), (True,)),
+                                   ((1, 0), (False,)), ((1, 1), (True,))]),
+                      kdims=['x', 'y'], vdims=['z'])
+        reduced = table.reduce(['y'], np.sum)
+        self.assertEquals(reduced.values(), [(2,), (1,)])
+
+    def test_table_reduce_custom_function(self):
+        reduced = self.table.reduce(['y'], np.median)
+        self.assertEquals(reduced.values(), [(2.,), (6.,)])
+
+    def test_table_groupby(self):
+        grouped = self.table.groupby(['x'])
+        self.assertEquals(grouped.keys(), [0, 1])
+        self.assertEquals(grouped[1].keys(), [0, 1, 2])
+        self.assertEquals(grouped[1].values(), [(2.,), (6.,), (7.,)])
+